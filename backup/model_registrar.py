@@ -4,7 +4,8 @@ Module: Model Registration Utility
 Purpose: Register and validate model definitions in the database
 Dependencies:
     - Database for model storage
-    - JSON Schema validation
+    - JSON Schema validation (fastjsonschema, optional)
+    - orjson (optional): For fast definition encoding and decoding
     - Model pattern verification
 
 This module provides utilities for registering model definitions in the
@@ -14,14 +15,143 @@ the JSONB structure against legacy models.
 
 import logging
 import json
+import time
 import uuid
-from typing import Dict, Any, List, Optional, Union
+from collections import OrderedDict
+from typing import Callable, Dict, Any, List, Optional, Tuple, Union
 
 from services.database.db_connector import DBConnector
 from services.models.core.model_registry import ModelRegistry
 
+try:
+    import fastjsonschema
+except ImportError:  # pragma: no cover - fastjsonschema is optional
+    fastjsonschema = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Encoded default for the use_cases and related_templates columns
+_EMPTY_JSON_ARRAY = json.dumps([])
+
+# Bounds for the per-registrar lookup caches; entries expire so changes made
+# by other processes or registrars are picked up
+_CACHE_MAXSIZE = 512
+_CACHE_TTL_SECONDS = 30.0
+
+
+def _encode_definition(definition: Dict[str, Any]) -> str:
+    """
+    Encode a model definition as canonical, compact JSON.
+    
+    Keys are sorted so equal definitions always produce the same payload, and
+    separators carry no whitespace to keep the payload sent to the database small.
+    
+    Args:
+        definition: Model definition dictionary
+        
+    Returns:
+        JSON string for the definition column
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            definition, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+        ).decode()
+    return json.dumps(definition, separators=(",", ":"), sort_keys=True)
+
+
+def _decode_definition(definition_json: str) -> Dict[str, Any]:
+    """Decode a stored model definition, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(definition_json)
+    return json.loads(definition_json)
+
+
+def _build_definition_schema(
+    required_definition_keys: List[str],
+    required_field_keys: List[str]
+) -> Dict[str, Any]:
+    """
+    Build the JSON Schema used as a fast path for model definition validation.
+    
+    Args:
+        required_definition_keys: Keys every definition must contain
+        required_field_keys: Keys every field definition must contain
+        
+    Returns:
+        JSON Schema matching the checks in ModelRegistrar._validate_model_definition
+    """
+    return {
+        "type": "object",
+        "required": list(required_definition_keys),
+        "properties": {
+            "fields": {
+                "type": "object",
+                "additionalProperties": {"type": "object", "required": list(required_field_keys)}
+            },
+            "validators": {
+                "type": "array",
+                "items": {"type": "object", "required": ["name", "fields", "code"]}
+            },
+            "metadata_schema": {"type": "object"}
+        }
+    }
+
+
+class _TTLCache:
+    """
+    Bounded cache whose entries expire a fixed time after they are stored.
+    
+    Entries are kept in insertion order; since every entry has the same
+    lifetime, the oldest one is also the next to expire and is evicted first
+    when the cache is full.
+    """
+    
+    def __init__(self, maxsize: int, ttl: float, timer: Callable[[], float] = time.monotonic):
+        """
+        Initialize an empty cache.
+        
+        Args:
+            maxsize: Maximum number of entries kept
+            ttl: Seconds an entry stays valid after it is stored
+            timer: Clock returning the current time in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the value stored for key, or default if it is missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at <= self._timer():
+            del self._entries[key]
+            return default
+        return value
+    
+    def __setitem__(self, key: str, value: Any) -> None:
+        """Store a value, evicting the oldest entry when the cache is full."""
+        self._entries.pop(key, None)
+        if len(self._entries) >= self.maxsize:
+            self._entries.popitem(last=False)
+        self._entries[key] = (self._timer() + self.ttl, value)
+    
+    def pop(self, key: str, default: Any = None) -> Any:
+        """Remove key and return its value, or default if it is not cached."""
+        entry = self._entries.pop(key, None)
+        return default if entry is None else entry[1]
+    
+    def __len__(self) -> int:
+        """Number of stored entries, including expired ones not yet evicted."""
+        return len(self._entries)
+
 
 class ModelRegistrar:
     """
@@ -45,16 +175,31 @@ class ModelRegistrar:
     # Valid model types
     VALID_MODEL_TYPES = ['alpha', 'beta', 'gamma', 'qualifier', 'organizer', 'prompt_template', 'prompt_chain']
     
-    def __init__(self, db_connector: Optional[DBConnector] = None, test_mode: Optional[str] = None):
+    # Constant-time membership set and pre-joined list for the error message
+    _VALID_MODEL_TYPE_SET = frozenset(VALID_MODEL_TYPES)
+    _VALID_MODEL_TYPES_TEXT = ", ".join(VALID_MODEL_TYPES)
+    
+    def __init__(
+        self,
+        db_connector: Optional[DBConnector] = None,
+        test_mode: Optional[str] = None,
+        id_factory: Callable[[], Any] = uuid.uuid4
+    ):
         """
         Initialize the model registrar.
         
         Args:
             db_connector: Optional database connector. If not provided, a new one will be created.
             test_mode: Test mode to use ('mock', 'e2e', or None for production)
+            id_factory: Callable producing new model IDs (defaults to uuid.uuid4)
         """
         self.test_mode = test_mode
         self.db_connector = db_connector or DBConnector(test_mode=test_mode)
+        self._new_id = id_factory
+        
+        # Per-instance definition cache keyed by model name, invalidated by
+        # _upsert_model; definitions are cached as their JSON encoding
+        self._def_cache = _TTLCache(_CACHE_MAXSIZE, _CACHE_TTL_SECONDS)
     
     async def register_model(
         self,
@@ -83,26 +228,18 @@ class ModelRegistrar:
             ValueError: If the model definition is invalid
         """
         # Validate model type
-        if model_type not in self.VALID_MODEL_TYPES:
-            valid_types = ", ".join(self.VALID_MODEL_TYPES)
-            raise ValueError(f"Invalid model type: {model_type}. Valid types are: {valid_types}")
+        if model_type not in self._VALID_MODEL_TYPE_SET:
+            raise ValueError(
+                f"Invalid model type: {model_type}. Valid types are: {self._VALID_MODEL_TYPES_TEXT}"
+            )
         
         # Validate model definition structure
         self._validate_model_definition(definition)
         
-        # Check if model already exists
-        existing_model_id = await self._check_existing_model(name)
-        
-        if existing_model_id:
-            # Update existing model
-            model_id = await self._update_existing_model(
-                existing_model_id, name, definition, description, model_type, version
-            )
-        else:
-            # Insert new model
-            model_id = await self._insert_new_model(
-                name, definition, description, model_type, version
-            )
+        # Insert the model, or update it if the name is already registered
+        model_id = await self._upsert_model(
+            name, definition, description, model_type, version
+        )
         
         # Optionally sync with in-memory registry
         if sync_with_registry:
@@ -120,6 +257,18 @@ class ModelRegistrar:
         Raises:
             ValueError: If the definition is invalid
         """
+        schema_error = None
+        if _VALIDATE_DEFINITION is not None:
+            try:
+                _VALIDATE_DEFINITION(definition)
+            except fastjsonschema.JsonSchemaException as e:
+                # Re-run the explicit checks below for a descriptive error message
+                schema_error = str(e)
+            else:
+                # JSON Schema arrays also accept tuples; the explicit checks require a list
+                if isinstance(definition.get('validators', []), list):
+                    return
+        
         # Check required keys
         missing_keys = [key for key in self.REQUIRED_DEFINITION_KEYS if key not in definition]
         if missing_keys:
@@ -161,24 +310,12 @@ class ModelRegistrar:
         metadata_schema = definition.get('metadata_schema', {})
         if not isinstance(metadata_schema, dict):
             raise ValueError("'metadata_schema' must be a dictionary")
-    
-    async def _check_existing_model(self, name: str) -> Optional[str]:
-        """
-        Check if a model with the given name already exists.
         
-        Args:
-            name: Model name
-            
-        Returns:
-            Model ID if found, None otherwise
-        """
-        query = "SELECT id FROM public.object_models WHERE name = $1"
-        result = await self.db_connector.execute(query, (name,), fetch_row=True)
-        return result['id'] if result else None
+        if schema_error:
+            raise ValueError(f"Invalid model definition: {schema_error}")
     
-    async def _update_existing_model(
+    async def _upsert_model(
         self,
-        model_id: str,
         name: str,
         definition: Dict[str, Any],
         description: str,
@@ -186,45 +323,10 @@ class ModelRegistrar:
         version: str
     ) -> str:
         """
-        Update an existing model in the database.
+        Insert a new model or update the existing one with the same name.
         
-        Args:
-            model_id: ID of the model to update
-            name: Model name
-            definition: Model definition dictionary
-            description: Model description
-            model_type: Type of model
-            version: Model version
-            
-        Returns:
-            Model ID
-        """
-        query = """
-            UPDATE public.object_models
-            SET definition = $1, description = $2, object_type = $3, version = $4, updated_at = NOW()
-            WHERE id = $5
-            RETURNING id
-        """
-        
-        result = await self.db_connector.execute(
-            query,
-            (json.dumps(definition), description, model_type, version, model_id),
-            fetch_row=True
-        )
-        
-        logger.info(f"Updated existing model {name} with ID {model_id}")
-        return result['id']
-    
-    async def _insert_new_model(
-        self,
-        name: str,
-        definition: Dict[str, Any],
-        description: str,
-        model_type: str,
-        version: str
-    ) -> str:
-        """
-        Insert a new model into the database.
+        This is the only write path for model definitions; it takes a single
+        round-trip and relies on the unique constraint on object_models.name.
         
         Args:
             name: Model name
@@ -234,28 +336,27 @@ class ModelRegistrar:
             version: Model version
             
         Returns:
-            Model ID
+            Model ID (the existing ID when the model was updated)
         """
-        model_id = str(uuid.uuid4())
-        
         query = """
             INSERT INTO public.object_models
             (id, name, object_type, version, definition, description, use_cases, related_templates, created_at, updated_at)
             VALUES ($1, $2, $3, $4, $5, $6, $7, $8, NOW(), NOW())
+            ON CONFLICT (name) DO UPDATE
+            SET definition = EXCLUDED.definition, description = EXCLUDED.description,
+                object_type = EXCLUDED.object_type, version = EXCLUDED.version, updated_at = NOW()
             RETURNING id
         """
         
-        # Default empty arrays for use_cases and related_templates
-        use_cases = []
-        related_templates = []
-        
         result = await self.db_connector.execute(
             query,
-            (model_id, name, model_type, version, json.dumps(definition), description, json.dumps(use_cases), json.dumps(related_templates)),
+            (str(self._new_id()), name, model_type, version, _encode_definition(definition), description, _EMPTY_JSON_ARRAY, _EMPTY_JSON_ARRAY),
             fetch_row=True
         )
         
-        logger.info(f"Inserted new model {name} with ID {model_id}")
+        self._def_cache.pop(name, None)
+        
+        logger.info(f"Registered model {name} with ID {result['id']}")
         return result['id']
     
     async def _sync_with_registry(self, name: str, definition: Dict[str, Any]) -> None:
@@ -300,8 +401,16 @@ class ModelRegistrar:
             model_name: Name of the model
             
         Returns:
-            Model definition dictionary, or None if not found
+            Model definition dictionary, or None if not found. Each call
+            returns a new dictionary, so callers may modify it freely
         """
+        # The cache holds the definition's JSON rather than the dictionary, so a
+        # hit decodes a fresh copy instead of sharing (or deep-copying) the nested
+        # fields and validators
+        cached = self._def_cache.get(model_name)
+        if cached is not None:
+            return _decode_definition(cached)
+        
         query = "SELECT definition FROM public.object_models WHERE name = $1"
         result = await self.db_connector.execute(query, (model_name,), fetch_row=True)
         
@@ -309,16 +418,30 @@ class ModelRegistrar:
             # Convert from JSON string to dictionary if necessary
             definition = result['definition']
             if isinstance(definition, str):
+                definition_json = definition
                 try:
-                    definition = json.loads(definition)
+                    definition = _decode_definition(definition)
                 except json.JSONDecodeError:
                     logger.error(f"Failed to decode definition JSON for model {model_name}")
                     return None
+            else:
+                definition_json = _encode_definition(definition)
             
+            self._def_cache[model_name] = definition_json
             return definition
         
         return None
     
     async def close(self) -> None:
         """Close the database connector."""
-        await self.db_connector.close() 
\ No newline at end of file
+        await self.db_connector.close() 
+
+
+# Compiled once at import from the registrar's required keys; None when
+# fastjsonschema is not installed
+_VALIDATE_DEFINITION = fastjsonschema.compile(
+    _build_definition_schema(
+        ModelRegistrar.REQUIRED_DEFINITION_KEYS,
+        ModelRegistrar.REQUIRED_FIELD_KEYS
+    )
+) if fastjsonschema else None
@@ -21,6 +21,23 @@ from services.models.core.model_registry import ModelRegistry
 
 logger = logging.getLogger(__name__)
 
+# Model field types mapped to the PostgreSQL types reported by information_schema
+_PG_TYPE_MAPPING = {
+    "str": "character varying",
+    "string": "character varying",
+    "int": "integer",
+    "float": "double precision",
+    "bool": "boolean",
+    "datetime": "timestamp without time zone",
+    "date": "date",
+    "UUID": "uuid",
+    "uuid": "uuid",
+    "json": "jsonb"
+}
+
+# Field types that don't map directly to a column
+_NON_COLUMN_TYPES = frozenset({"Dict", "List", "dict", "list"})
+
 
 class SchemaInspector:
     """
@@ -79,71 +96,97 @@ class SchemaInspector:
         tables = await self.setup._get_existing_tables(schema_name)
         logger.debug(f"Found {len(tables)} tables in schema '{schema_name}'")
         
-        # Collect detailed information for each table
-        tables_info = {}
-        for table in tables:
-            # Get column information
-            columns = await self.db.execute(
-                """
-                SELECT 
-                    column_name, 
-                    data_type, 
-                    is_nullable, 
-                    column_default
-                FROM 
-                    information_schema.columns 
-                WHERE 
-                    table_schema = $1 
-                    AND table_name = $2
-                ORDER BY 
-                    ordinal_position
-                """,
-                [schema_name, table],
-                fetch_all=True
-            )
-            
-            # Get primary key information
-            primary_keys = await self.db.execute(
-                """
-                SELECT 
-                    kcu.column_name
-                FROM 
-                    information_schema.table_constraints tc
-                    JOIN information_schema.key_column_usage kcu
-                      ON tc.constraint_name = kcu.constraint_name
-                      AND tc.table_schema = kcu.table_schema
-                WHERE 
-                    tc.constraint_type = 'PRIMARY KEY'
-                    AND tc.table_schema = $1
-                    AND tc.table_name = $2
-                """,
-                [schema_name, table],
-                fetch_all=True
-            )
-            
-            # Get indexes
-            indexes = await self.db.execute(
-                """
-                SELECT
-                    indexname,
-                    indexdef
-                FROM
-                    pg_indexes
-                WHERE
-                    schemaname = $1
-                    AND tablename = $2
-                """,
-                [schema_name, table],
-                fetch_all=True
-            )
-            
-            # Store table information
-            tables_info[table] = {
-                "columns": columns,
-                "primary_keys": [pk["column_name"] for pk in primary_keys],
-                "indexes": indexes
+        # An empty schema has nothing to look up in the catalogs
+        if not tables:
+            return {
+                "exists": True,
+                "name": schema_name,
+                "tables": tables,
+                "tables_info": {}
             }
         
+        # Collect detailed information for all tables with one query per catalog
+        tables_info = {
+            table: {"columns": [], "primary_keys": [], "indexes": []}
+            for table in tables
+        }
+        
+        # Get column information
+        columns = await self.db.execute(
+            """
+            SELECT 
+                table_name,
+                column_name, 
+                data_type, 
+                is_nullable, 
+                column_default
+            FROM 
+                information_schema.columns 
+            WHERE 
+                table_schema = $1
+            ORDER BY 
+                table_name,
+                ordinal_position
+            """,
+            [schema_name],
+            fetch_all=True
+        )
+        for col in columns:
+            table_info = tables_info.get(col["table_name"])
+            if table_info is not None:
+                table_info["columns"].append({
+                    "column_name": col["column_name"],
+                    "data_type": col["data_type"],
+                    "is_nullable": col["is_nullable"],
+                    "column_default": col["column_default"]
+                })
+        
+        # Get primary key information
+        primary_keys = await self.db.execute(
+            """
+            SELECT 
+                tc.table_name,
+                kcu.column_name
+            FROM 
+                information_schema.table_constraints tc
+                JOIN information_schema.key_column_usage kcu
+                  ON tc.constraint_name = kcu.constraint_name
+                  AND tc.table_schema = kcu.table_schema
+            WHERE 
+                tc.constraint_type = 'PRIMARY KEY'
+                AND tc.table_schema = $1
+            """,
+            [schema_name],
+            fetch_all=True
+        )
+        for pk in primary_keys:
+            table_info = tables_info.get(pk["table_name"])
+            if table_info is not None:
+                table_info["primary_keys"].append(pk["column_name"])
+        
+        # Get indexes
+        indexes = await self.db.execute(
+            """
+            SELECT
+                tablename,
+                indexname,
+                indexdef
+            FROM
+                pg_indexes
+            WHERE
+                schemaname = $1
+            """,
+            [schema_name],
+            fetch_all=True
+        )
+        for index in indexes:
+            table_info = tables_info.get(index["tablename"])
+            if table_info is not None:
+                table_info["indexes"].append({
+                    "indexname": index["indexname"],
+                    "indexdef": index["indexdef"]
+                })
+        
         return {
             "exists": True,
             "name": schema_name,
@@ -188,45 +231,35 @@ class SchemaInspector:
                 "available_tables": db_info["tables"]
             }
             
-        # Get table columns
-        columns = {}
-        for col in db_info["tables_info"][table_name]["columns"]:
-            columns[col["column_name"]] = col
+        # Map column names to their data types
+        column_types = {
+            col["column_name"]: col["data_type"]
+            for col in db_info["tables_info"][table_name]["columns"]
+        }
             
         # Check if all required fields have corresponding columns
         missing_columns = []
         type_mismatches = []
         
         for field_name, field_def in model_schema.get("fields", {}).items():
+            field_type = field_def.get("type")
+            
             # Skip fields that don't map directly to columns
-            if field_def.get("type") in ["Dict", "List", "dict", "list"]:
+            if field_type in _NON_COLUMN_TYPES:
                 continue
-                
-            # Map model types to PostgreSQL types
-            type_mapping = {
-                "str": "character varying",
-                "string": "character varying",
-                "int": "integer",
-                "float": "double precision",
-                "bool": "boolean",
-                "datetime": "timestamp without time zone",
-                "date": "date",
-                "UUID": "uuid",
-                "uuid": "uuid",
-                "json": "jsonb"
-            }
             
-            expected_type = type_mapping.get(field_def.get("type"), "character varying")
+            required = field_def.get("required", True)
+            actual_type = column_types.get(field_name)
             
             # Check if column exists
-            if field_name not in columns:
-                if field_def.get("required", True):
+            if actual_type is None:
+                if required:
                     missing_columns.append(field_name)
                 continue
                 
-            # Check column type
-            actual_type = columns[field_name]["data_type"]
-            if actual_type != expected_type and field_def.get("required", True):
+            # Check column type against the PostgreSQL type for the model type
+            expected_type = _PG_TYPE_MAPPING.get(field_type, "character varying")
+            if actual_type != expected_type and required:
                 type_mismatches.append({
                     "field": field_name,
                     "expected_type": expected_type,
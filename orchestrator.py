@@ -25,6 +25,10 @@ from services.models.registrar import ModelRegistrar
 logger = logging.getLogger(__name__)
 
 
+# Supported test modes (None is production)
+_VALID_TEST_MODES = frozenset({None, 'e2e', 'mock'})
+
+
 class ModelOrchestrator:
     """
     Orchestrator for model-related operations.
@@ -42,7 +46,13 @@ class ModelOrchestrator:
         
         Args:
             test_mode: Test mode to use ('mock', 'e2e', or None for production)
+            
+        Raises:
+            ValueError: If the test mode is not supported
         """
+        if test_mode not in _VALID_TEST_MODES:
+            raise ValueError(f"Invalid test mode: {test_mode}")
+        
         # Store the previous test mode so we can restore it later
         self._previous_test_mode = config.settings.TEST_MODE
         
@@ -7,7 +7,7 @@ DEPENDENCIES:
 
 import logging
 import uuid
-from typing import Dict, List, Any, Optional, Union, TypedDict
+from typing import Callable, Dict, List, Any, Optional, Union, TypedDict
 
 from services.database.db_operator import DBOperator
 from services.database.helpers.constants import ModelTableColumns
@@ -29,12 +29,13 @@ class ModelDefinition(TypedDict):
 class ModelRegistrar:
     """Handles registration, retrieval and management of model definitions in the database."""
     
-    def __init__(self, test_mode: Optional[str] = None):
+    def __init__(self, test_mode: Optional[str] = None, id_factory: Callable[[], Any] = uuid.uuid4):
         """
         Initialize the ModelRegistrar with an optional test mode.
         
         Args:
             test_mode: Optional mode for testing ('mock', 'e2e', or None for production)
+            id_factory: Callable producing new model IDs (defaults to uuid.uuid4)
         """
         # Store the previous test mode so we can restore it later
         self._previous_test_mode = config.settings.TEST_MODE
@@ -46,6 +47,7 @@ class ModelRegistrar:
         # Create the DB operator which will use the global test mode
         self.db = DBOperator()
         self.test_mode = test_mode
+        self._new_id = id_factory
         
     async def register_model_in_db(
         self,
@@ -68,7 +70,7 @@ class ModelRegistrar:
         Returns:
             The UUID of the registered model
         """
-        model_id = str(uuid.uuid4())
+        model_id = str(self._new_id())
         
         # Prepare the model record
         model_record = {
@@ -69,6 +69,25 @@ WHERE metadata->'references' @> %s::jsonb
 ORDER BY created_at DESC
 """
 
+# Keyset pages of GET_OBJECTS_BY_REFERENCE; id breaks created_at ties so
+# consecutive pages neither skip nor repeat rows
+GET_OBJECTS_BY_REFERENCE_PAGE = """
+SELECT id, content_type, title, slug, content, metadata, created_at, updated_at
+FROM {schema_name}.contents
+WHERE metadata->'references' @> %s::jsonb
+ORDER BY created_at DESC, id DESC
+LIMIT %s
+"""
+
+GET_OBJECTS_BY_REFERENCE_PAGE_AFTER = """
+SELECT id, content_type, title, slug, content, metadata, created_at, updated_at
+FROM {schema_name}.contents
+WHERE metadata->'references' @> %s::jsonb
+AND (created_at, id) < (%s, %s::uuid)
+ORDER BY created_at DESC, id DESC
+LIMIT %s
+"""
+
 GET_OBJECTS_BY_REFERENCED_BY = """
 SELECT id, content_type, title, slug, content, metadata, created_at, updated_at
 FROM {schema_name}.contents
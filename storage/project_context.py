@@ -7,6 +7,7 @@ DEPENDENCIES:
     - services.database.db_connector: For database operations
     - uuid: For ID generation
     - datetime: For timestamp management
+    - orjson (optional): For fast context serialization
 """
 
 import logging
@@ -15,10 +16,30 @@ import json
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
 from services.database.db_connector import DBConnector
 
 logger = logging.getLogger(__name__)
 
+
+def _dumps_context(context: Dict[str, Any]) -> str:
+    """Serialize a context payload to a JSON string, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(context, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(context)
+
+
+def _loads_context(context_json: Any) -> Dict[str, Any]:
+    """Deserialize a stored context payload, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(context_json)
+    return json.loads(context_json)
+
+
 class ProjectContextStorage:
     """
     Storage operations for project context.
@@ -59,8 +80,9 @@ class ProjectContextStorage:
             context_id = str(uuid.uuid4())
             now = datetime.utcnow()
             
-            # Convert dictionaries to JSON strings
-            context_json = json.dumps(context)
+            # Convert dictionaries to JSON strings. Params keep the stdlib
+            # encoding because get_context matches them by their JSON text.
+            context_json = _dumps_context(context)
             params_json = json.dumps(context_params)
             
             # Insert into database
@@ -128,7 +150,7 @@ class ProjectContextStorage:
             
             # Parse context from JSON
             if result and 'context' in result:
-                return json.loads(result['context'])
+                return _loads_context(result['context'])
                 
             return None
             
@@ -155,7 +177,7 @@ class ProjectContextStorage:
         """
         try:
             # Convert context to JSON
-            context_json = json.dumps(context)
+            context_json = _dumps_context(context)
             now = datetime.utcnow()
             
             # Update in database
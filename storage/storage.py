@@ -14,9 +14,11 @@ in the Content Generation Framework. It handles metadata enrichment, cross-refer
 and maintains referential integrity through metadata-based relationships.
 """
 
+import os
 import uuid
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional
 from contextlib import contextmanager
 
 from services.database.db_operator import DBOperator
@@ -27,6 +29,8 @@ from services.models.storage.models import (
     GET_OBJECTS_BY_PARENT,
     GET_OBJECTS_BY_HIERARCHY,
     GET_OBJECTS_BY_REFERENCE,
+    GET_OBJECTS_BY_REFERENCE_PAGE,
+    GET_OBJECTS_BY_REFERENCE_PAGE_AFTER,
     GET_OBJECTS_BY_REFERENCED_BY,
     SEARCH_OBJECTS,
     UPDATE_OBJECT,
@@ -35,6 +39,72 @@ from services.models.storage.models import (
     BATCH_UPDATE_OBJECTS
 )
 
+# Invariants shared by every template adaptation. The tags tuple is never
+# mutated downstream and serializes to the same JSON array as a list.
+_ADAPTED_TAGS = ("adapted_template",)
+_DEFAULT_METADATA_VERSION = "1.0"
+
+
+def _format_uuid4(raw: bytes) -> str:
+    """Format 16 random bytes as a version 4 UUID string."""
+    b = bytearray(raw)
+    b[6] = (b[6] & 0x0F) | 0x40
+    b[8] = (b[8] & 0x3F) | 0x80
+    h = b.hex()
+    return f"{h[0:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:32]}"
+
+
+def _fast_uuid4() -> str:
+    """Generate a random version 4 UUID string without building a UUID object."""
+    return _format_uuid4(os.urandom(16))
+
+
+def _fast_uuid4_batch(count: int) -> List[str]:
+    """Generate several version 4 UUID strings from a single urandom call."""
+    raw = os.urandom(16 * count)
+    return [_format_uuid4(raw[i:i + 16]) for i in range(0, 16 * count, 16)]
+
+
+@dataclass(frozen=True)
+class AdaptedTemplate:
+    """
+    Template adapted for a specific site or project.
+    
+    Returned by DatabaseTemplateStorage.get_template_adaptation_record;
+    get_template_adaptation returns the to_dict() form of the same record.
+    """
+    __slots__ = (
+        "id", "name", "template_text", "variables", "model", "temperature",
+        "original_template_id", "site_id", "project_id", "created_at", "updated_at"
+    )
+    id: str
+    name: str
+    template_text: str
+    variables: Dict[str, Any]
+    model: str
+    temperature: float
+    original_template_id: Optional[str]
+    site_id: Optional[str]
+    project_id: Optional[str]
+    created_at: datetime
+    updated_at: datetime
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the adaptation to the dictionary shape used by the template API."""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "template_text": self.template_text,
+            "variables": self.variables,
+            "model": self.model,
+            "temperature": self.temperature,
+            "original_template_id": self.original_template_id,
+            "site_id": self.site_id,
+            "project_id": self.project_id,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at
+        }
+
 class ObjectStorage:
     def __init__(self, db_operator: DBOperator, schema_name: str = "public"):
         """
@@ -147,7 +217,7 @@ class ObjectStorage:
         Returns:
             str: Generated UUID for the object
         """
-        object_id = str(uuid.uuid4())
+        object_id = _fast_uuid4()
         slug = self._generate_slug(title)
         
         # Enrich metadata
@@ -173,7 +243,8 @@ class ObjectStorage:
 
     def batch_store_objects(
         self,
-        objects: List[Dict[str, Any]]
+        objects: List[Dict[str, Any]],
+        parent_levels: Optional[Dict[str, int]] = None
     ) -> List[str]:
         """
         Store multiple objects in a single transaction.
@@ -185,22 +256,30 @@ class ObjectStorage:
                     - content: Dict[str, Any]
                     - metadata: Optional[Dict[str, Any]]
                     - parent_id: Optional[str]
+            parent_levels: Hierarchy levels of parents the caller already
+                    fetched, keyed by parent ID; other parents are looked up
                     
         Returns:
             List[str]: List of generated UUIDs
         """
-        object_ids = []
+        object_ids = _fast_uuid4_batch(len(objects))
         values = []
-        
-        for obj in objects:
-            object_id = str(uuid.uuid4())
-            object_ids.append(object_id)
+        # Hierarchy level per parent, fetched once per batch
+        parent_levels = dict(parent_levels) if parent_levels else {}
+        
+        for object_id, obj in zip(object_ids, objects):
+            # Look up each distinct parent only once
+            parent_id = obj.get('parent_id')
+            if parent_id and parent_id not in parent_levels:
+                parent = self.get_object(parent_id)
+                parent_levels[parent_id] = parent['metadata'].get('hierarchy_level', 0)
             
             # Enrich metadata
             enriched_metadata = self._enrich_metadata(
                 obj.get('metadata', {}),
                 obj['content_type'],
-                obj.get('parent_id')
+                parent_id,
+                parent_level=parent_levels.get(parent_id)
             )
             
             # Generate slug
@@ -342,6 +421,46 @@ class ObjectStorage:
             (f'[{{"id": "{reference_id}"}}]', limit, offset)
         )
 
+    def iter_objects_by_reference(
+        self,
+        reference_id: str,
+        limit: int = 100,
+        page_size: int = 50
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate over objects that reference a specific object.
+        
+        Rows are fetched one page at a time, so callers that stop at the
+        first match never pull the remaining pages from the database. Pages
+        continue after the (created_at, id) of the previous page's last row
+        instead of using OFFSET, so rows are neither skipped nor repeated.
+        
+        Args:
+            reference_id: ID of referenced object
+            limit: Maximum number of objects to yield
+            page_size: Number of rows fetched per round-trip
+        
+        Yields:
+            Dict[str, Any]: Referencing objects, newest first
+        """
+        reference = f'[{{"id": "{reference_id}"}}]'
+        first_page_query = GET_OBJECTS_BY_REFERENCE_PAGE.format(schema_name=self.schema_name)
+        next_page_query = GET_OBJECTS_BY_REFERENCE_PAGE_AFTER.format(schema_name=self.schema_name)
+        
+        remaining = limit
+        last = None
+        while remaining > 0:
+            size = min(page_size, remaining)
+            if last is None:
+                page = self.db.fetch_all(first_page_query, (reference, size))
+            else:
+                page = self.db.fetch_all(next_page_query, (reference, last['created_at'], last['id'], size))
+            yield from page
+            if len(page) < size:
+                return
+            remaining -= size
+            last = page[-1]
+
     def get_objects_by_referenced_by(
         self,
         referenced_by_id: str,
@@ -511,7 +630,8 @@ class ObjectStorage:
         self,
         metadata: Dict[str, Any],
         content_type: str,
-        parent_id: Optional[str]
+        parent_id: Optional[str],
+        parent_level: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Enrich metadata with additional fields.
@@ -520,6 +640,7 @@ class ObjectStorage:
             metadata: Original metadata
             content_type: Type of content
             parent_id: ID of parent object
+            parent_level: Hierarchy level of the parent, if already known
             
         Returns:
             Dict[str, Any]: Enriched metadata
@@ -528,8 +649,9 @@ class ObjectStorage:
         
         # Add hierarchy level
         if parent_id:
-            parent = self.get_object(parent_id)
-            parent_level = parent['metadata'].get('hierarchy_level', 0)
+            if parent_level is None:
+                parent = self.get_object(parent_id)
+                parent_level = parent['metadata'].get('hierarchy_level', 0)
             enriched['hierarchy_level'] = parent_level + 1
         else:
             enriched['hierarchy_level'] = 0
@@ -904,24 +1026,30 @@ class DatabaseTemplateStorage:
         if not original:
             raise ValueError(f"Original template {template_id} not found")
         
-        adaptation_id = str(uuid.uuid4())
+        # Bind the original's content and metadata once
+        oc = original["content"]
+        om = original["metadata"]
+        at = adapted_template
+        model_default = oc.get("model", "gpt-4-turbo")
+        temp_default = oc.get("temperature", 0.7)
+        
         title = f"{original['title']} (Adapted)"
         
         # Prepare content
         content = {
-            "template_text": adapted_template.get("template_text", ""),
-            "variables": adapted_template.get("variables", {}),
-            "model": adapted_template.get("model", original["content"].get("model", "gpt-4-turbo")),
-            "temperature": adapted_template.get("temperature", original["content"].get("temperature", 0.7)),
+            "template_text": at.get("template_text", ""),
+            "variables": at.get("variables", {}),
+            "model": at.get("model", model_default),
+            "temperature": at.get("temperature", temp_default),
             "original_template_id": template_id
         }
         
         # Prepare metadata
         metadata = {
-            "category": original["metadata"].get("category", "general"),
-            "version": adapted_template.get("version", "1.0"),
+            "category": om.get("category", "general"),
+            "version": at.get("version", _DEFAULT_METADATA_VERSION),
             "status": "active",
-            "tags": ["adapted_template"],
+            "tags": _ADAPTED_TAGS,
             "site_id": site_id,
             "project_id": project_id
         }
@@ -937,6 +1065,69 @@ class DatabaseTemplateStorage:
         
         return stored_id
     
+    def batch_store_template_adaptations(
+        self,
+        template_id: str,
+        adaptations: List[Dict[str, Any]]
+    ) -> List[str]:
+        """
+        Store several adapted versions of a template in a single batch.
+        
+        The original template is fetched once and all adaptations are written
+        with one batch insert, instead of one read and one write per adaptation.
+        
+        Args:
+            template_id: ID of the original template
+            adaptations: List of adapted template dictionaries, each optionally
+                containing 'site_id' and 'project_id'
+                
+        Returns:
+            List[str]: IDs of the stored adaptations, in input order
+        """
+        # Get original template
+        original = self.storage.get_object(template_id)
+        if not original:
+            raise ValueError(f"Original template {template_id} not found")
+        
+        # Bind the original's content and metadata once
+        oc = original["content"]
+        om = original["metadata"]
+        model_default = oc.get("model", "gpt-4-turbo")
+        temp_default = oc.get("temperature", 0.7)
+        category = om.get("category", "general")
+        title = f"{original['title']} (Adapted)"
+        
+        objects = [
+            {
+                "content_type": "adapted_prompt_template",
+                "title": title,
+                "content": {
+                    "template_text": at.get("template_text", ""),
+                    "variables": at.get("variables", {}),
+                    "model": at.get("model", model_default),
+                    "temperature": at.get("temperature", temp_default),
+                    "original_template_id": template_id
+                },
+                "metadata": {
+                    "category": category,
+                    "version": at.get("version", _DEFAULT_METADATA_VERSION),
+                    "status": "active",
+                    "tags": _ADAPTED_TAGS,
+                    "site_id": at.get("site_id"),
+                    "project_id": at.get("project_id")
+                },
+                "parent_id": template_id
+            }
+            for at in adaptations
+        ]
+        
+        # Use ObjectStorage to store all adaptations at once; the original is
+        # their parent, so reuse its hierarchy level instead of fetching it again
+        return self.storage.batch_store_objects(
+            objects,
+            parent_levels={template_id: om.get("hierarchy_level", 0)}
+        )
+    
     def get_template_adaptation(
         self,
         template_id: str,
@@ -954,26 +1145,49 @@ class DatabaseTemplateStorage:
         Returns:
             Optional[Dict[str, Any]]: Adapted template if found, None otherwise
         """
-        # Get adaptations that reference this template
-        adaptations = self.storage.get_objects_by_reference(template_id)
+        adaptation = self.get_template_adaptation_record(template_id, site_id, project_id)
+        return adaptation.to_dict() if adaptation is not None else None
+    
+    def get_template_adaptation_record(
+        self,
+        template_id: str,
+        site_id: Optional[str] = None,
+        project_id: Optional[str] = None
+    ) -> Optional[AdaptedTemplate]:
+        """
+        Get an adapted template for a site or project as an AdaptedTemplate.
+        
+        Args:
+            template_id: ID of the original template
+            site_id: Optional site ID
+            project_id: Optional project ID
+            
+        Returns:
+            Optional[AdaptedTemplate]: Adapted template if found, None otherwise
+        """
+        # Nothing can match without a site or project, so skip the lookup
+        if not site_id and not project_id:
+            return None
         
-        # Filter by site_id and project_id
-        for adaptation in adaptations:
-            if (site_id and adaptation["metadata"].get("site_id") == site_id) or \
-               (project_id and adaptation["metadata"].get("project_id") == project_id):
+        # Stream adaptations that reference this template and stop at the first match
+        for adaptation in self.storage.iter_objects_by_reference(template_id):
+            metadata = adaptation["metadata"]
+            if (site_id and metadata.get("site_id") == site_id) or \
+               (project_id and metadata.get("project_id") == project_id):
+                content = adaptation["content"]
                 # Convert to template format
-                return {
-                    "id": adaptation["id"],
-                    "name": adaptation["title"],
-                    "template_text": adaptation["content"].get("template_text", ""),
-                    "variables": adaptation["content"].get("variables", {}),
-                    "model": adaptation["content"].get("model", "gpt-4-turbo"),
-                    "temperature": adaptation["content"].get("temperature", 0.7),
-                    "original_template_id": adaptation["content"].get("original_template_id"),
-                    "site_id": adaptation["metadata"].get("site_id"),
-                    "project_id": adaptation["metadata"].get("project_id"),
-                    "created_at": adaptation["created_at"],
-                    "updated_at": adaptation["updated_at"]
-                }
+                return AdaptedTemplate(
+                    id=adaptation["id"],
+                    name=adaptation["title"],
+                    template_text=content.get("template_text", ""),
+                    variables=content.get("variables", {}),
+                    model=content.get("model", "gpt-4-turbo"),
+                    temperature=content.get("temperature", 0.7),
+                    original_template_id=content.get("original_template_id"),
+                    site_id=metadata.get("site_id"),
+                    project_id=metadata.get("project_id"),
+                    created_at=adaptation["created_at"],
+                    updated_at=adaptation["updated_at"]
+                )
         
         return None
\ No newline at end of file
@@ -4,17 +4,147 @@ PURPOSE: Provides vector database storage for object embeddings
 DEPENDENCIES:
     - logging: For operation tracking
     - typing: For type annotations
+    - numpy (optional): For similarity search over supplied embeddings
 
 This module provides the VectorObjectStorage class for storing and retrieving 
 vector embeddings of content objects. This is a mock implementation that logs 
-operations but doesn't perform actual vector storage.
+operations but doesn't generate embeddings itself; embeddings supplied by the
+caller are kept in a contiguous float32 matrix and searched with a single
+matrix-vector product.
 """
 
 import logging
-from typing import Dict, Any, List, Optional, Tuple, Union
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
 
 logger = logging.getLogger(__name__)
 
+
+@dataclass
+class _VecEntry:
+    """Slotted record for a single entry in the mock vector storage."""
+    __slots__ = ("content", "metadata", "content_type")
+    content: Dict[str, Any]
+    metadata: Dict[str, Any]
+    content_type: Optional[str]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the entry to the dictionary shape returned by the public API."""
+        return {
+            "content": self.content,
+            "metadata": self.metadata,
+            "content_type": self.content_type
+        }
+
+
+class _EmbeddingIndex:
+    """
+    Structure-of-arrays store of normalized embeddings.
+    
+    Rows live in a preallocated float32 matrix that grows geometrically;
+    deletions move the last row into the freed slot so the live rows stay
+    contiguous and a search is a single matrix-vector product.
+    """
+    
+    _INITIAL_CAPACITY = 64
+    
+    def __init__(self, dimension: int):
+        """
+        Initialize an empty index.
+        
+        Args:
+            dimension: Length of the embeddings stored in the index
+        """
+        if np is None:
+            raise ImportError("numpy is required to store embeddings in VectorObjectStorage")
+        self.dimension = dimension
+        self.ids: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self.vectors = np.empty((self._INITIAL_CAPACITY, dimension), dtype=np.float32)
+    
+    def normalize(self, embedding: Sequence[float]) -> "np.ndarray":
+        """
+        Convert an embedding to a unit-length float32 vector.
+        
+        Raises:
+            ValueError: If the embedding does not match the index dimension
+        """
+        vector = np.asarray(embedding, dtype=np.float32)
+        if vector.shape != (self.dimension,):
+            raise ValueError(
+                f"Expected embedding of dimension {self.dimension}, got shape {vector.shape}"
+            )
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def upsert(self, content_id: str, vector: "np.ndarray") -> None:
+        """Insert or replace the vector for a content ID (already normalized)."""
+        row = self.rows.get(content_id)
+        if row is None:
+            row = len(self.ids)
+            if row == self.vectors.shape[0]:
+                grown = np.empty((row * 2, self.dimension), dtype=np.float32)
+                grown[:row] = self.vectors
+                self.vectors = grown
+            self.ids.append(content_id)
+            self.rows[content_id] = row
+        self.vectors[row] = vector
+    
+    def remove(self, content_id: str) -> None:
+        """Remove the embedding for a content ID, if present."""
+        row = self.rows.pop(content_id, None)
+        if row is None:
+            return
+        last = len(self.ids) - 1
+        if row != last:
+            moved_id = self.ids[last]
+            self.vectors[row] = self.vectors[last]
+            self.ids[row] = moved_id
+            self.rows[moved_id] = row
+        self.ids.pop()
+    
+    def search(
+        self,
+        query_embedding: Sequence[float],
+        limit: int,
+        mask: Optional["np.ndarray"] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Find the rows most similar to a query embedding.
+        
+        Args:
+            query_embedding: Query embedding
+            limit: Maximum number of results to return
+            mask: Optional boolean mask over live rows selecting candidates
+            
+        Returns:
+            List of (content_id, cosine similarity) pairs, best match first
+        """
+        count = len(self.ids)
+        if count == 0 or limit <= 0:
+            return []
+        
+        scores = self.vectors[:count] @ self.normalize(query_embedding)
+        candidates = np.arange(count)
+        if mask is not None:
+            candidates = candidates[mask]
+            scores = scores[mask]
+        if scores.size == 0:
+            return []
+        
+        if limit < scores.size:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            top = np.arange(scores.size)
+        top = top[np.argsort(-scores[top])]
+        return [(self.ids[candidates[i]], float(scores[i])) for i in top]
+
+
 class VectorObjectStorage:
     """
     Mock implementation of vector database storage for content objects.
@@ -27,14 +157,16 @@ class VectorObjectStorage:
     def __init__(self):
         """Initialize the vector object storage."""
         logger.warning("Using mock implementation of VectorObjectStorage")
-        self.storage = {}  # Mock storage dictionary
+        self.storage: Dict[str, _VecEntry] = {}  # Mock storage dictionary
+        self._index: Optional[_EmbeddingIndex] = None  # Created with the first embedding
     
     async def store_content_vectors(
         self,
         content_id: str,
         content: Dict[str, Any],
         metadata: Optional[Dict[str, Any]] = None,
-        content_type: Optional[str] = None
+        content_type: Optional[str] = None,
+        embedding: Optional[Sequence[float]] = None
     ) -> str:
         """
         Store vector embeddings for a content object.
@@ -44,17 +176,32 @@ class VectorObjectStorage:
             content: Content object data
             metadata: Additional metadata
             content_type: Type of content
+            embedding: Precomputed embedding of the content (requires numpy)
             
         Returns:
             Vector ID (same as content_id in mock implementation)
+            
+        Raises:
+            ImportError: If an embedding is given and numpy is not installed
+            ValueError: If the embedding does not match the stored dimension
         """
-        logger.info(f"Mock storing vector embeddings for content ID: {content_id}")
+        logger.info("Mock storing vector embeddings for content ID: %s", content_id)
+        # Validate the embedding before touching storage so a bad one leaves no partial entry
+        index = self._index
+        vector = None
+        if embedding is not None:
+            if index is None:
+                index = _EmbeddingIndex(len(embedding))
+            vector = index.normalize(embedding)
+            self._index = index
+            
         # Store in mock storage
-        self.storage[content_id] = {
-            "content": content,
-            "metadata": metadata or {},
-            "content_type": content_type
-        }
+        self.storage[content_id] = _VecEntry(content, metadata or {}, content_type)
+        if vector is not None:
+            index.upsert(content_id, vector)
+        elif index is not None:
+            # Drop any embedding left over from a previous store of this ID
+            index.remove(content_id)
         return content_id
     
     async def update_content_vectors(
@@ -74,16 +221,18 @@ class VectorObjectStorage:
         Returns:
             True if successful, False otherwise
         """
-        logger.info(f"Mock updating vector embeddings for content ID: {content_id}")
-        if content_id not in self.storage:
-            logger.warning(f"Content ID {content_id} not found in vector storage")
+        logger.info("Mock updating vector embeddings for content ID: %s", content_id)
+        try:
+            entry = self.storage[content_id]
+        except KeyError:
+            logger.warning("Content ID %s not found in vector storage", content_id)
             return False
             
         # Update in mock storage
         if content:
-            self.storage[content_id]["content"] = content
+            entry.content = content
         if metadata:
-            self.storage[content_id]["metadata"] = metadata
+            entry.metadata = metadata
         return True
         
     async def delete_content_vectors(self, content_id: str) -> bool:
@@ -96,13 +245,15 @@ class VectorObjectStorage:
         Returns:
             True if successful, False otherwise
         """
-        logger.info(f"Mock deleting vector embeddings for content ID: {content_id}")
-        if content_id not in self.storage:
-            logger.warning(f"Content ID {content_id} not found in vector storage")
-            return False
-            
+        logger.info("Mock deleting vector embeddings for content ID: %s", content_id)
         # Delete from mock storage
-        del self.storage[content_id]
+        try:
+            del self.storage[content_id]
+        except KeyError:
+            logger.warning("Content ID %s not found in vector storage", content_id)
+            return False
+        if self._index is not None:
+            self._index.remove(content_id)
         return True
         
     async def get_content_vectors(self, content_id: str) -> Optional[Dict[str, Any]]:
@@ -115,28 +266,69 @@ class VectorObjectStorage:
         Returns:
             Vector embeddings data or None if not found
         """
-        logger.info(f"Mock retrieving vector embeddings for content ID: {content_id}")
-        return self.storage.get(content_id)
+        logger.info("Mock retrieving vector embeddings for content ID: %s", content_id)
+        entry = self.storage.get(content_id)
+        return entry.to_dict() if entry is not None else None
         
     async def search_similar_content(
         self,
         query_text: str,
         limit: int = 10,
         content_type: Optional[str] = None,
-        metadata_filters: Optional[Dict[str, Any]] = None
+        metadata_filters: Optional[Dict[str, Any]] = None,
+        query_embedding: Optional[Sequence[float]] = None
     ) -> List[Dict[str, Any]]:
         """
         Search for content objects similar to a query text.
         
+        The mock cannot embed text, so results are only returned when the
+        caller supplies the query's embedding.
+        
         Args:
             query_text: Query text to search for
             limit: Maximum number of results to return
             content_type: Filter by content type
             metadata_filters: Filter by metadata values
+            query_embedding: Precomputed embedding of the query text
             
         Returns:
             List of similar content objects with similarity scores
         """
-        logger.info(f"Mock searching for content similar to: {query_text}")
-        # Return mock results (empty list)
-        return [] 
\ No newline at end of file
+        logger.info("Mock searching for content similar to: %s", query_text)
+        if query_embedding is None or self._index is None:
+            # Return mock results (empty list)
+            return []
+        
+        index = self._index
+        mask = None
+        if content_type is not None or metadata_filters:
+            mask = np.fromiter(
+                (
+                    self._matches(self.storage[content_id], content_type, metadata_filters)
+                    for content_id in index.ids
+                ),
+                dtype=bool,
+                count=len(index.ids)
+            )
+        
+        results = []
+        for content_id, score in index.search(query_embedding, limit, mask):
+            result = self.storage[content_id].to_dict()
+            result["id"] = content_id
+            result["score"] = score
+            results.append(result)
+        return results
+    
+    @staticmethod
+    def _matches(
+        entry: _VecEntry,
+        content_type: Optional[str],
+        metadata_filters: Optional[Dict[str, Any]]
+    ) -> bool:
+        """Check whether an entry satisfies the content type and metadata filters."""
+        if content_type is not None and entry.content_type != content_type:
+            return False
+        if metadata_filters:
+            metadata = entry.metadata
+            return all(metadata.get(key) == value for key, value in metadata_filters.items())
+        return True 
\ No newline at end of file
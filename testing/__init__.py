@@ -8,7 +8,10 @@ This module provides testing utilities for model operations, including
 decorators for test mode configuration and test data setup.
 """
 
-from services.models.testing.decorators import with_model_test_mode
+from services.models.testing.decorators import (
+    with_model_test_mode,
+    close_pooled_orchestrators
+)
 
 # Export the decorator
-__all__ = ["with_model_test_mode"]
+__all__ = ["with_model_test_mode", "close_pooled_orchestrators"]
@@ -4,6 +4,7 @@ PURPOSE: Decorators to facilitate testing of model operations
 DEPENDENCIES:
     - services.models.orchestrator: For model orchestration
     - services.database.testing: For database testing utilities
+    - config.settings: For the global test mode restored around pooled calls
 
 This module provides decorators that simplify testing of model-related operations
 with various test modes (production, end-to-end, mock).
@@ -11,29 +12,101 @@ with various test modes (production, end-to-end, mock).
 
 import functools
 import logging
-from typing import Any, Callable, Optional, TypeVar
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, TypeVar
 
-from services.models.orchestrator import ModelOrchestrator
+import config.settings
+
+if TYPE_CHECKING:
+    from services.models.orchestrator import ModelOrchestrator
 
 # Type variable for function return type
 T = TypeVar('T')
 
 logger = logging.getLogger(__name__)
 
+# Orchestrators shared between decorated calls, keyed by test mode
+_ORCH_POOL: Dict[Optional[str], "ModelOrchestrator"] = {}
+
+
+def _orchestrator_class() -> type:
+    """
+    Import ModelOrchestrator on first use.
+    
+    The orchestrator pulls in the registrar and the database layer, so the
+    import is deferred until a decorated function actually runs instead of
+    happening when test modules are collected. The class is cached as a
+    module global, which also lets tests patch it here.
+    """
+    orchestrator_class = globals().get("ModelOrchestrator")
+    if orchestrator_class is None:
+        from services.models.orchestrator import ModelOrchestrator as orchestrator_class
+        globals()["ModelOrchestrator"] = orchestrator_class
+    return orchestrator_class
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve ModelOrchestrator lazily when accessed as a module attribute."""
+    if name == "ModelOrchestrator":
+        return _orchestrator_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _get_pooled_orchestrator(mode: Optional[str]) -> "ModelOrchestrator":
+    """
+    Get the pooled orchestrator for a test mode, creating it on first use.
+    
+    Construction is synchronous, so there is no await point between the
+    lookup and the insertion and no lock is needed.
+    
+    Args:
+        mode: Test mode of the orchestrator
+        
+    Returns:
+        ModelOrchestrator instance shared by all calls using this mode
+    """
+    orchestrator = _ORCH_POOL.get(mode)
+    if orchestrator is None:
+        orchestrator = _orchestrator_class()(test_mode=mode)
+        _ORCH_POOL[mode] = orchestrator
+    return orchestrator
+
 
-def with_model_test_mode(mode: Optional[str] = None):
+async def close_pooled_orchestrators() -> None:
+    """
+    Close every pooled orchestrator and empty the pool.
+    
+    Must be awaited on the event loop the pooled orchestrators were used on
+    (e.g. from a session fixture's teardown). The global test mode is left
+    as it was before the call, since each orchestrator restores the value it
+    saw when it was created.
+    """
+    test_mode = config.settings.TEST_MODE
+    try:
+        while _ORCH_POOL:
+            _, orchestrator = _ORCH_POOL.popitem()
+            await orchestrator.close()
+    finally:
+        config.settings.TEST_MODE = test_mode
+
+
+def with_model_test_mode(mode: Optional[str] = None, fresh: bool = True):
     """
     Decorator for configuring model operations with a specific test mode.
     
-    This decorator creates a ModelOrchestrator instance with the specified
-    test mode and injects it into the decorated function. It ensures proper
-    resource cleanup after execution.
+    This decorator injects a ModelOrchestrator configured with the specified
+    test mode into the decorated function. By default each call gets its own
+    orchestrator, closed afterwards. With fresh=False orchestrators are pooled
+    per mode and reused across calls; the global test mode is still set and
+    restored around every call, and the pool must be closed explicitly with
+    close_pooled_orchestrators().
     
     Args:
         mode: Test mode to use:
             - None: Production mode (default)
             - 'e2e': End-to-end test mode (uses test database)
             - 'mock': Mock mode (no database connection)
+        fresh: Create a dedicated orchestrator for each call and close it
+            afterwards (default); False reuses a pooled orchestrator per mode
             
     Returns:
         Decorator function
@@ -51,8 +124,19 @@ def with_model_test_mode(mode: Optional[str] = None):
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
         @functools.wraps(func)
         async def wrapper(*args, **kwargs) -> T:
+            if not fresh:
+                # A pooled orchestrator is not closed after the call, so restore
+                # the global test mode its construction (or this call) changed
+                previous_test_mode = config.settings.TEST_MODE
+                try:
+                    orchestrator = _get_pooled_orchestrator(mode)
+                    config.settings.TEST_MODE = mode if mode else previous_test_mode
+                    return await func(orchestrator, *args, **kwargs)
+                finally:
+                    config.settings.TEST_MODE = previous_test_mode
+            
             # Create orchestrator with specified test mode
-            orchestrator = ModelOrchestrator(test_mode=mode)
+            orchestrator = _orchestrator_class()(test_mode=mode)
             
             try:
                 # Call the original function with the orchestrator
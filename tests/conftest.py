@@ -0,0 +1,57 @@
+"""
+Shared pytest configuration for the Models Service tests.
+"""
+import pytest
+import pytest_asyncio
+from unittest.mock import patch
+
+from services.models.testing import close_pooled_orchestrators
+
+
+def pytest_collection_modifyitems(items):
+    """Run every asyncio test on a single session-scoped event loop."""
+    session_loop = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if item.get_closest_marker("asyncio") is not None:
+            # Prepend so this marker is the closest one pytest-asyncio resolves
+            item.add_marker(session_loop, append=False)
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session", autouse=True)
+async def pooled_orchestrators():
+    """Close orchestrators pooled by with_model_test_mode(fresh=False) at the end of the session."""
+    yield
+    await close_pooled_orchestrators()
+
+
+@pytest.fixture(scope="class")
+def orchestrator_patch():
+    """Patch the ModelOrchestrator used by the test-mode decorator once per test class."""
+    with patch('services.models.testing.decorators.ModelOrchestrator') as mock_orchestrator_class:
+        yield mock_orchestrator_class
+
+
+class StubOrchestrator:
+    """Minimal stand-in for ModelOrchestrator that only tracks its mode and closes."""
+    
+    def __init__(self, test_mode=None):
+        self.test_mode = test_mode
+        self.close_calls = 0
+    
+    async def close(self):
+        """Count calls instead of releasing resources."""
+        self.close_calls += 1
+
+
+@pytest.fixture
+def orchestrator_mock(orchestrator_patch):
+    """Reset the patched ModelOrchestrator class and return the stub orchestrator it builds."""
+    orchestrator_patch.reset_mock()
+    stub = StubOrchestrator()
+    
+    def _build(test_mode=None):
+        stub.test_mode = test_mode
+        return stub
+    
+    orchestrator_patch.side_effect = _build
+    return stub
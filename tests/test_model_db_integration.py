@@ -0,0 +1,97 @@
+"""
+Test module for the model/database integration utilities.
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from services.models.utils import model_db_integration
+
+
+class _StubOrchestrator:
+    """Stand-in for the orchestrator that serves one schema dict and accepts any data."""
+    
+    def __init__(self, schema):
+        self.schema = schema
+        self.validated = []
+    
+    async def get_model(self, model_name):
+        """Return the schema when the name matches, like ModelRegistry.get_schema."""
+        return self.schema if model_name == self.schema["model_name"] else None
+    
+    async def validate_data(self, model_name, data):
+        """Record the data and report it valid."""
+        self.validated.append(data)
+        return SimpleNamespace(is_valid=True, valid_data=data, errors=[])
+
+
+class _FakeDB:
+    """Async stand-in for DBOperator that records queries and returns queued rows."""
+    
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+    
+    async def execute(self, query, values=None, return_rows=False):
+        """Record the query and return the queued rows."""
+        self.queries.append((query, values))
+        return self.rows
+
+
+@pytest.fixture
+def stub_orchestrator(monkeypatch):
+    """Replace the orchestrator used by the integration helpers with a stub."""
+    stub = _StubOrchestrator({
+        "model_name": "Article",
+        "model_type": "content",
+        "fields": {
+            "title": {"name": "title", "type": "str", "required": True},
+            "views": {"name": "views", "type": "int", "required": False}
+        },
+        "validators": []
+    })
+    monkeypatch.setattr(model_db_integration, "orchestrator", stub)
+    return stub
+
+
+@pytest.mark.asyncio
+class TestFetchAndValidate:
+    """Test cases for fetch_and_validate."""
+    
+    async def test_fetch_projects_id_and_model_fields(self, stub_orchestrator):
+        """Test that the record is fetched with its id and the model's fields and then validated."""
+        row = {"id": 7, "title": "Hello", "views": 3}
+        db = _FakeDB([row])
+        
+        result = await model_db_integration.fetch_and_validate("Article", 7, db=db)
+        
+        assert result["success"] is True
+        assert result["data"] == row
+        assert db.queries == [("SELECT id, title, views FROM public.article WHERE id = $1", [7])]
+        assert stub_orchestrator.validated == [row]
+    
+    async def test_fetch_uses_schema_table_name(self, stub_orchestrator):
+        """Test that a table_name in the schema overrides the default table."""
+        stub_orchestrator.schema["table_name"] = "articles"
+        db = _FakeDB([{"id": 7, "title": "Hello", "views": 3}])
+        
+        await model_db_integration.fetch_and_validate("Article", 7, schema="content", db=db)
+        
+        assert db.queries[0][0] == "SELECT id, title, views FROM content.articles WHERE id = $1"
+    
+    async def test_fetch_missing_record(self, stub_orchestrator):
+        """Test that a missing record is reported without validating anything."""
+        result = await model_db_integration.fetch_and_validate("Article", 8, db=_FakeDB([]))
+        
+        assert result["success"] is False
+        assert "Record with ID 8 not found in public.article" in result["message"]
+        assert stub_orchestrator.validated == []
+    
+    async def test_fetch_unknown_model(self, stub_orchestrator):
+        """Test that an unknown model is reported before touching the database."""
+        db = _FakeDB([])
+        
+        result = await model_db_integration.fetch_and_validate("Missing", 1, db=db)
+        
+        assert result == {"success": False, "message": "Model 'Missing' not found"}
+        assert db.queries == []
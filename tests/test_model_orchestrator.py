@@ -33,7 +33,16 @@ class TestModelOrchestratorTestMode:
             orchestrator = ModelOrchestrator(test_mode='mock')
             assert orchestrator.test_mode == 'mock'
             mock_registrar.assert_called_once_with(test_mode='mock')
-    
+
+    def test_init_invalid_mode(self):
+        """Test initializing the orchestrator with an unsupported test mode."""
+        with patch('services.models.orchestrator.ModelRegistrar') as mock_registrar, \
+             patch('config.settings.TEST_MODE', None):
+            with pytest.raises(ValueError) as excinfo:
+                ModelOrchestrator(test_mode='staging')
+            assert "Invalid test mode" in str(excinfo.value)
+            mock_registrar.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_verify_db_schema_propagates_test_mode(self):
         """Test that verify_db_schema passes test_mode to SchemaInspector."""
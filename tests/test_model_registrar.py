@@ -3,53 +3,88 @@ Test module for the ModelRegistrar utility.
 """
 import json
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, patch
 
 from services.models.registrar import ModelRegistrar
+from services.models.backup import model_registrar as legacy_registrar_module
+from services.models.backup.model_registrar import ModelRegistrar as LegacyModelRegistrar
 from services.database.db_operator import DBOperator
 import config.settings
 
 
-@pytest.fixture
-def valid_model_definition():
-    """Return a valid model definition for testing."""
-    return {
-        "name": "TestModel",
-        "fields": {
-            "title": {
-                "type": "str",
-                "args": {
-                    "description": "The test title"
-                }
-            },
-            "content": {
-                "type": "str",
-                "args": {
-                    "description": "Main test content"
-                }
+class _FakeDB:
+    """Lightweight async stand-in for the DB connector that records each execute call."""
+    
+    def __init__(self):
+        self.calls = []
+        self.results = []
+    
+    async def execute(self, query, params=None, **kwargs):
+        """Record the call and return the next queued result (None when exhausted)."""
+        self.calls.append((query, params, kwargs))
+        return self.results.pop(0) if self.results else None
+    
+    async def close(self):
+        """Mirror the connector's close method."""
+        pass
+
+
+# Invalid model definitions paired with the expected error message, built once per session
+INVALID_MODEL_DEFINITIONS = [
+    ({"fields": {}}, "Missing required keys in model definition: name"),
+    ({"name": "TestModel", "fields": "title"}, "'fields' must be a dictionary"),
+    ({"name": "TestModel", "fields": {"title": {"args": {}}}}, "Missing required keys in field 'title': type"),
+    ({"name": "TestModel", "fields": {"title": "str"}}, "Field definition for 'title' must be a dictionary"),
+    ({"name": "TestModel", "fields": {}, "validators": {}}, "'validators' must be a list"),
+    ({"name": "TestModel", "fields": {}, "validators": ({"name": "v", "fields": ["title"], "code": "pass"},)}, "'validators' must be a list"),
+    ({"name": "TestModel", "fields": {}, "validators": ["title_not_empty"]}, "Each validator must be a dictionary"),
+    ({"name": "TestModel", "fields": {}, "validators": [{"name": "v", "fields": ["title"]}]}, "Each validator must have a 'code' key"),
+    ({"name": "TestModel", "fields": {}, "metadata_schema": []}, "'metadata_schema' must be a dictionary"),
+]
+
+
+# Valid model definition shared by every test; tests must not mutate it
+VALID_MODEL_DEFINITION = {
+    "name": "TestModel",
+    "fields": {
+        "title": {
+            "type": "str",
+            "args": {
+                "description": "The test title"
             }
         },
-        "metadata_schema": {
-            "required": ["content_type", "tags"],
-            "recommended": ["difficulty_level"]
-        },
-        "validators": [
-            {
-                "name": "title_not_empty",
-                "fields": ["title"],
-                "pre": True,
-                "code": "def title_not_empty(cls, v):\n    if not v.strip():\n        raise ValueError('Title cannot be empty')\n    return v"
+        "content": {
+            "type": "str",
+            "args": {
+                "description": "Main test content"
             }
-        ]
-    }
+        }
+    },
+    "metadata_schema": {
+        "required": ["content_type", "tags"],
+        "recommended": ["difficulty_level"]
+    },
+    "validators": [
+        {
+            "name": "title_not_empty",
+            "fields": ["title"],
+            "pre": True,
+            "code": "def title_not_empty(cls, v):\n    if not v.strip():\n        raise ValueError('Title cannot be empty')\n    return v"
+        }
+    ]
+}
 
 
-@pytest.fixture
-def invalid_model_definition():
-    """Return an invalid model definition missing required keys."""
-    return {
-        "fields": {}  # Missing "name" key
-    }
+@pytest.fixture(scope="session")
+def valid_model_definition():
+    """Return a valid model definition for testing."""
+    return VALID_MODEL_DEFINITION
+
+
+@pytest.fixture(scope="session")
+def valid_model_definition_json():
+    """Return the canonical compact JSON encoding of the valid model definition."""
+    return json.dumps(VALID_MODEL_DEFINITION, separators=(",", ":"), sort_keys=True)
 
 
 class TestModelRegistrar:
@@ -57,10 +92,8 @@ class TestModelRegistrar:
     
     @pytest.fixture
     def mock_db_connector(self):
-        """Create a mock DB connector."""
-        mock = MagicMock()
-        mock.execute = AsyncMock()
-        return mock
+        """Create a fake DB connector."""
+        return _FakeDB()
     
     @pytest.fixture
     def registrar(self, mock_db_connector):
@@ -68,6 +101,11 @@ class TestModelRegistrar:
         with patch('services.database.db_operator.DBOperator', return_value=mock_db_connector):
             return ModelRegistrar(test_mode='mock')
     
+    @pytest.fixture
+    def legacy_registrar(self, mock_db_connector):
+        """Create a legacy ModelRegistrar backed by the fake DB connector that assigns the ID "test_id"."""
+        return LegacyModelRegistrar(db_connector=mock_db_connector, id_factory=lambda: "test_id")
+    
     def test_init(self):
         """Test initializing the registrar."""
         # Create a test instance
@@ -82,89 +120,118 @@ class TestModelRegistrar:
             assert registrar_with_mode.test_mode == 'mock'
             assert config.settings.TEST_MODE == 'mock'
     
-    def test_validate_model_definition_valid(self, registrar, valid_model_definition):
+    @pytest.fixture(params=["schema", "explicit"])
+    def definition_checks(self, request, monkeypatch):
+        """Run definition validation with and without the fastjsonschema fast path."""
+        if request.param == "explicit":
+            monkeypatch.setattr(legacy_registrar_module, "_VALIDATE_DEFINITION", None)
+        return request.param
+    
+    def test_validate_model_definition_valid(self, legacy_registrar, valid_model_definition, definition_checks):
         """Test validating a valid model definition."""
         # This should not raise an exception
-        # Since _validate_model_definition is not a method in the new implementation, skip this test
-        pass
-    
-    def test_validate_model_definition_invalid(self, registrar, invalid_model_definition):
-        """Test validating an invalid model definition."""
-        # Skip this test as we're not validating models in this implementation
-        pass
-    
-    def test_validate_model_definition_invalid_fields(self, registrar):
-        """Test validating a definition with invalid fields."""
-        # Skip this test as we're not validating models in this implementation
-        pass
-    
-    def test_validate_model_definition_missing_field_keys(self, registrar):
-        """Test validating a definition with fields missing required keys."""
-        # Skip this test as we're not validating models in this implementation
-        pass
-    
-    def test_validate_model_definition_invalid_validators(self, registrar):
-        """Test validating a definition with invalid validators."""
-        # Skip this test as we're not validating models in this implementation
-        pass
-    
-    def test_validate_model_definition_invalid_validator_entry(self, registrar):
-        """Test validating a definition with an invalid validator entry."""
-        # Skip this test as we're not validating models in this implementation
-        pass
-    
-    def test_validate_model_definition_missing_validator_keys(self, registrar):
-        """Test validating a definition with validators missing required keys."""
-        # Skip this test as we're not validating models in this implementation
-        pass
+        legacy_registrar._validate_model_definition(valid_model_definition)
     
-    def test_validate_model_definition_invalid_metadata_schema(self, registrar):
-        """Test validating a definition with an invalid metadata schema."""
-        # Skip this test as we're not validating models in this implementation
-        pass
+    @pytest.mark.parametrize("definition,message", INVALID_MODEL_DEFINITIONS)
+    def test_validate_model_definition_rejects(self, legacy_registrar, definition, message, definition_checks):
+        """Test that invalid model definitions raise the same ValueError with or without fastjsonschema."""
+        with pytest.raises(ValueError) as excinfo:
+            legacy_registrar._validate_model_definition(definition)
+        assert message in str(excinfo.value)
     
     @pytest.mark.asyncio
-    async def test_check_existing_model_exists(self, registrar, mock_db_connector):
-        """Test checking for an existing model that exists."""
-        # Skip this test as the method is no longer part of the public API
-        pass
-    
-    @pytest.mark.asyncio
-    async def test_check_existing_model_not_exists(self, registrar, mock_db_connector):
-        """Test checking for an existing model that doesn't exist."""
-        # Skip this test as the method is no longer part of the public API  
-        pass
+    @pytest.mark.parametrize("stored_as_json", [True, False])
+    async def test_get_model_definition_returns_copy(self, legacy_registrar, mock_db_connector, valid_model_definition, valid_model_definition_json, stored_as_json):
+        """Test that mutating a returned definition does not corrupt the cached one."""
+        stored = valid_model_definition_json if stored_as_json else json.loads(valid_model_definition_json)
+        mock_db_connector.results = [{"definition": stored}]
+        
+        first = await legacy_registrar.get_model_definition("TestModel")
+        first["fields"]["title"]["type"] = "int"
+        first["validators"].clear()
+        
+        second = await legacy_registrar.get_model_definition("TestModel")
+        
+        assert second == valid_model_definition
+        assert len(mock_db_connector.calls) == 1
     
     @pytest.mark.asyncio
-    async def test_update_existing_model(self, registrar, mock_db_connector, valid_model_definition):
-        """Test updating an existing model."""
-        # Skip this test as the method is no longer part of the public API
-        pass
+    async def test_get_model_definition_cache_expires(self, legacy_registrar, mock_db_connector, valid_model_definition_json):
+        """Test that a cached definition is fetched again once its TTL has passed."""
+        now = [0.0]
+        legacy_registrar._def_cache = legacy_registrar_module._TTLCache(512, 30.0, timer=lambda: now[0])
+        mock_db_connector.results = [
+            {"definition": valid_model_definition_json},
+            {"definition": json.dumps({"name": "TestModel", "fields": {}})}
+        ]
+        
+        await legacy_registrar.get_model_definition("TestModel")
+        now[0] = 29.0
+        await legacy_registrar.get_model_definition("TestModel")
+        assert len(mock_db_connector.calls) == 1
+        
+        now[0] = 30.0
+        refreshed = await legacy_registrar.get_model_definition("TestModel")
+        assert refreshed == {"name": "TestModel", "fields": {}}
+        assert len(mock_db_connector.calls) == 2
     
-    @pytest.mark.asyncio
-    async def test_insert_new_model(self, registrar, mock_db_connector, valid_model_definition):
-        """Test inserting a new model."""
-        # Skip this test as the method is no longer part of the public API
-        pass
+    def test_ttl_cache_is_bounded(self):
+        """Test that the lookup cache evicts its oldest entry once full."""
+        cache = legacy_registrar_module._TTLCache(maxsize=2, ttl=30.0)
+        cache["a"] = 1
+        cache["b"] = 2
+        cache["a"] = 3
+        cache["c"] = 4
+        
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") == 3
+        assert cache.pop("c") == 4
+        assert cache.pop("c") is None
     
-    @pytest.mark.skip("Not using real database connections in tests")
     @pytest.mark.asyncio
-    async def test_register_model_new(self, registrar, mock_db_connector, valid_model_definition):
+    async def test_register_model_new(self, legacy_registrar, mock_db_connector, valid_model_definition, valid_model_definition_json):
         """Test registering a new model."""
-        # Skip this test as it requires a real database connection
-        pass
+        mock_db_connector.results = [{"id": "test_id"}]
+        
+        model_id = await legacy_registrar.register_model(
+            "TestModel", valid_model_definition, "Test description"
+        )
+        
+        assert model_id == "test_id"
+        # A single upsert round-trip registers the model
+        assert len(mock_db_connector.calls) == 1
+        query, params, _ = mock_db_connector.calls[0]
+        assert "INSERT INTO public.object_models" in query
+        assert "ON CONFLICT (name) DO UPDATE" in query
+        assert params[:4] == ("test_id", "TestModel", "alpha", "1.0")
+        assert params[4] == valid_model_definition_json
     
     @pytest.mark.asyncio
-    async def test_register_model_update(self, registrar, mock_db_connector, valid_model_definition):
+    async def test_register_model_update(self, legacy_registrar, mock_db_connector, valid_model_definition):
         """Test updating an existing model."""
-        # This test should be skipped as updating is now handled differently
-        pass
+        # The upsert returns the ID of the row that already had this name
+        mock_db_connector.results = [{"id": "123"}]
+        
+        model_id = await legacy_registrar.register_model(
+            "TestModel", valid_model_definition, "Test description", model_type="beta", version="2.0"
+        )
+        
+        assert model_id == "123"
+        assert len(mock_db_connector.calls) == 1
+        _, params, _ = mock_db_connector.calls[0]
+        assert params[1:4] == ("TestModel", "beta", "2.0")
     
     @pytest.mark.asyncio
-    async def test_register_model_invalid_type(self, registrar, valid_model_definition):
+    async def test_register_model_invalid_type(self, legacy_registrar, mock_db_connector, valid_model_definition):
         """Test registering a model with an invalid type."""
-        # This test should be skipped as validation is now handled differently
-        pass
+        with pytest.raises(ValueError) as excinfo:
+            await legacy_registrar.register_model(
+                "TestModel", valid_model_definition, "Test description", model_type="invalid"
+            )
+        
+        assert "Invalid model type" in str(excinfo.value)
+        assert mock_db_connector.calls == []
     
     @pytest.mark.asyncio
     async def test_list_registered_models(self, registrar, mock_db_connector):
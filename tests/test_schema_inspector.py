@@ -10,113 +10,106 @@ from services.models.db_schema_inspector import SchemaInspector
 class TestSchemaInspectorTestMode:
     """Test cases for the SchemaInspector with different test modes."""
     
-    def test_init_default_mode(self):
-        """Test initializing the inspector with default mode (production)."""
-        with patch('services.models.db_schema_inspector.DBConnector') as mock_connector, \
-             patch('services.models.db_schema_inspector.SchemaSetup') as mock_setup, \
-             patch('config.settings.TEST_MODE', None):
-            inspector = SchemaInspector()
-            assert inspector.test_mode is None
-            mock_connector.assert_called_once()
-            mock_setup.assert_called_once()
+    @pytest.fixture
+    def patched_inspector(self, monkeypatch):
+        """
+        Return a factory that builds a SchemaInspector with mocked dependencies.
+        
+        The factory sets TEST_MODE for the test and returns the inspector along
+        with the mock DB connector and schema setup instances it was given.
+        """
+        mock_connector = AsyncMock()
+        mock_setup = AsyncMock()
+        monkeypatch.setattr('services.models.db_schema_inspector.DBConnector', MagicMock(return_value=mock_connector))
+        monkeypatch.setattr('services.models.db_schema_inspector.SchemaSetup', MagicMock(return_value=mock_setup))
+        
+        def _make(mode=None):
+            monkeypatch.setattr('config.settings.TEST_MODE', mode)
+            return SchemaInspector(test_mode=mode), mock_connector, mock_setup
+        
+        return _make
     
-    def test_init_e2e_mode(self):
-        """Test initializing the inspector with e2e test mode."""
-        with patch('services.models.db_schema_inspector.DBConnector') as mock_connector, \
-             patch('services.models.db_schema_inspector.SchemaSetup') as mock_setup, \
-             patch('config.settings.TEST_MODE', 'e2e'):
-            inspector = SchemaInspector(test_mode='e2e')
-            assert inspector.test_mode == 'e2e'
-            mock_connector.assert_called_once()
-            mock_setup.assert_called_once()
-    
-    def test_init_mock_mode(self):
-        """Test initializing the inspector with mock test mode."""
-        with patch('services.models.db_schema_inspector.DBConnector') as mock_connector, \
-             patch('services.models.db_schema_inspector.SchemaSetup') as mock_setup, \
-             patch('config.settings.TEST_MODE', 'mock'):
-            inspector = SchemaInspector(test_mode='mock')
-            assert inspector.test_mode == 'mock'
-            mock_connector.assert_called_once()
-            mock_setup.assert_called_once()
+    @pytest.mark.parametrize("mode", [None, 'e2e', 'mock'])
+    def test_init_modes(self, patched_inspector, mode):
+        """Test initializing the inspector in production and each test mode."""
+        inspector, mock_connector, mock_setup = patched_inspector(mode)
+        assert inspector.test_mode == mode
+        assert inspector.db is mock_connector
+        assert inspector.setup is mock_setup
     
     @pytest.mark.asyncio
-    async def test_close_with_test_mode(self):
+    async def test_close_with_test_mode(self, patched_inspector):
         """Test that close method calls close on all dependencies."""
-        with patch('services.models.db_schema_inspector.DBConnector') as mock_connector_class, \
-             patch('services.models.db_schema_inspector.SchemaSetup') as mock_setup_class, \
-             patch('config.settings.TEST_MODE', 'e2e'):
-            # Set up mocks
-            mock_connector = AsyncMock()
-            mock_setup = AsyncMock()
-            
-            mock_connector_class.return_value = mock_connector
-            mock_setup_class.return_value = mock_setup
-            
-            # Create inspector with test mode
-            inspector = SchemaInspector(test_mode='e2e')
-            
-            # Call close
-            await inspector.close()
-            
-            # Assert close was called on dependencies
-            mock_connector.close.assert_called_once()
-            mock_setup.close.assert_called_once()
+        inspector, mock_connector, mock_setup = patched_inspector('e2e')
+        
+        # Call close
+        await inspector.close()
+        
+        # Assert close was called on dependencies
+        mock_connector.close.assert_called_once()
+        mock_setup.close.assert_called_once()
     
     @pytest.mark.asyncio
-    async def test_inspect_schema_with_test_mode(self):
+    async def test_inspect_schema_with_test_mode(self, patched_inspector):
         """Test that inspect_schema uses test_mode correctly."""
-        with patch('services.models.db_schema_inspector.DBConnector') as mock_connector_class, \
-             patch('services.models.db_schema_inspector.SchemaSetup') as mock_setup_class, \
-             patch('config.settings.TEST_MODE', 'e2e'):
-            # Set up mocks
-            mock_connector = AsyncMock()
-            mock_setup = AsyncMock()
-            
-            # Configure mock_setup._schema_exists to return True
-            mock_setup._schema_exists = AsyncMock(return_value=True)
-            
-            # Configure mock_setup._get_existing_tables to return a list of tables
-            mock_setup._get_existing_tables = AsyncMock(return_value=["table1", "table2"])
-            
-            # Configure mock_connector.execute to return column info
-            mock_connector.execute = AsyncMock(return_value=[])
-            
-            mock_connector_class.return_value = mock_connector
-            mock_setup_class.return_value = mock_setup
-            
-            # Create inspector with test mode
-            inspector = SchemaInspector(test_mode='e2e')
-            
-            # Call inspect_schema
-            result = await inspector.inspect_schema("test_schema")
-            
-            # Assert _schema_exists was called with correct parameters
-            mock_setup._schema_exists.assert_called_once_with("test_schema")
-            
-            # Assert _get_existing_tables was called with correct parameters
-            mock_setup._get_existing_tables.assert_called_once_with("test_schema")
-            
-            # Assert result contains expected data
-            assert result["exists"] is True
-            assert result["name"] == "test_schema"
-            assert "table1" in result["tables"]
-            assert "table2" in result["tables"]
+        inspector, mock_connector, mock_setup = patched_inspector('e2e')
+        
+        # Configure mock_setup._schema_exists to return True
+        mock_setup._schema_exists = AsyncMock(return_value=True)
+        
+        # Configure mock_setup._get_existing_tables to return a list of tables
+        mock_setup._get_existing_tables = AsyncMock(return_value=["table1", "table2"])
+        
+        # Configure mock_connector.execute to return column, primary key and index rows
+        mock_connector.execute = AsyncMock(side_effect=[
+            [
+                {"table_name": "table1", "column_name": "id", "data_type": "uuid", "is_nullable": "NO", "column_default": None},
+                {"table_name": "table2", "column_name": "name", "data_type": "text", "is_nullable": "YES", "column_default": None}
+            ],
+            [{"table_name": "table1", "column_name": "id"}],
+            [{"tablename": "table1", "indexname": "table1_pkey", "indexdef": "CREATE UNIQUE INDEX table1_pkey ON test_schema.table1 (id)"}]
+        ])
+        
+        # Call inspect_schema
+        result = await inspector.inspect_schema("test_schema")
+        
+        # Assert _schema_exists was called with correct parameters
+        mock_setup._schema_exists.assert_called_once_with("test_schema")
+        
+        # Assert _get_existing_tables was called with correct parameters
+        mock_setup._get_existing_tables.assert_called_once_with("test_schema")
+        
+        # Assert result contains expected data
+        assert result["exists"] is True
+        assert result["name"] == "test_schema"
+        assert "table1" in result["tables"]
+        assert "table2" in result["tables"]
+        
+        # Assert all tables were inspected with one query per catalog
+        assert mock_connector.execute.call_count == 3
+        table1 = result["tables_info"]["table1"]
+        assert [col["column_name"] for col in table1["columns"]] == ["id"]
+        assert table1["primary_keys"] == ["id"]
+        assert table1["indexes"][0]["indexname"] == "table1_pkey"
+        assert result["tables_info"]["table2"]["primary_keys"] == []
     
     @pytest.mark.asyncio
-    async def test_verify_model_schema_with_test_mode(self):
+    async def test_inspect_empty_schema_skips_catalog_queries(self, patched_inspector):
+        """Test that a schema without tables is returned without querying the catalogs."""
+        inspector, mock_connector, mock_setup = patched_inspector('e2e')
+        mock_setup._schema_exists = AsyncMock(return_value=True)
+        mock_setup._get_existing_tables = AsyncMock(return_value=[])
+        mock_connector.execute = AsyncMock()
+        
+        result = await inspector.inspect_schema("empty_schema")
+        
+        assert result == {"exists": True, "name": "empty_schema", "tables": [], "tables_info": {}}
+        mock_connector.execute.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_verify_model_schema_with_test_mode(self, patched_inspector):
         """Test that verify_model_schema uses test_mode correctly."""
-        with patch('services.models.db_schema_inspector.DBConnector') as mock_connector_class, \
-             patch('services.models.db_schema_inspector.SchemaSetup') as mock_setup_class, \
-             patch('services.models.db_schema_inspector.ModelRegistry') as mock_registry, \
-             patch('config.settings.TEST_MODE', 'e2e'):
-            # Set up mocks
-            mock_connector = AsyncMock()
-            mock_setup = AsyncMock()
-            
-            mock_connector_class.return_value = mock_connector
-            mock_setup_class.return_value = mock_setup
-            
+        with patch('services.models.db_schema_inspector.ModelRegistry') as mock_registry:
             # Mock ModelRegistry.get_schema
             model_schema = {
                 "model_name": "test_model",
@@ -154,7 +147,7 @@ class TestSchemaInspectorTestMode:
                 }
                 
                 # Create inspector with test mode
-                inspector = SchemaInspector(test_mode='e2e')
+                inspector, _, _ = patched_inspector('e2e')
                 
                 # Call verify_model_schema
                 result = await inspector.verify_model_schema("test_schema", "test_model")
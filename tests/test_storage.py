@@ -0,0 +1,208 @@
+"""
+Test module for ObjectStorage and DatabaseTemplateStorage.
+"""
+from datetime import datetime
+
+import pytest
+
+from services.models.storage.storage import AdaptedTemplate, DatabaseTemplateStorage, ObjectStorage
+
+
+class _FakeDBOperator:
+    """Synchronous stand-in for DBOperator that records calls and replays queued rows."""
+    
+    def __init__(self):
+        self.calls = []
+        self.fetch_all_results = []
+        self.objects = {}
+    
+    def execute(self, query, params=None):
+        """Record the statement."""
+        self.calls.append(("execute", query, params))
+    
+    def execute_batch(self, query, values):
+        """Record the batch statement and its rows."""
+        self.calls.append(("execute_batch", query, values))
+    
+    def fetch_one(self, query, params=None):
+        """Record the query and return the stored object whose ID is the first parameter."""
+        self.calls.append(("fetch_one", query, params))
+        return self.objects.get(params[0])
+    
+    def fetch_all(self, query, params=None):
+        """Record the query and return the next queued result (empty when exhausted)."""
+        self.calls.append(("fetch_all", query, params))
+        return self.fetch_all_results.pop(0) if self.fetch_all_results else []
+    
+    def begin_transaction(self):
+        """Transactions are not simulated."""
+    
+    def commit_transaction(self):
+        """Transactions are not simulated."""
+    
+    def rollback_transaction(self):
+        """Transactions are not simulated."""
+    
+    def calls_to(self, method):
+        """Return the recorded calls made through one method."""
+        return [call for call in self.calls if call[0] == method]
+
+
+CREATED_AT = datetime(2024, 1, 1, 12, 0)
+
+
+def _adaptation_row(adaptation_id, site_id=None, project_id=None):
+    """Build a contents row for a template adaptation."""
+    return {
+        "id": adaptation_id,
+        "title": f"Adaptation {adaptation_id}",
+        "content": {
+            "template_text": "Hello {name}",
+            "variables": {"name": "str"},
+            "model": "gpt-4o",
+            "temperature": 0.2,
+            "original_template_id": "template-1"
+        },
+        "metadata": {"site_id": site_id, "project_id": project_id},
+        "created_at": CREATED_AT,
+        "updated_at": CREATED_AT
+    }
+
+
+@pytest.fixture
+def fake_db():
+    """Fresh fake DB operator for each test."""
+    return _FakeDBOperator()
+
+
+class TestObjectStorage:
+    """Test cases for ObjectStorage."""
+    
+    def test_iter_objects_by_reference_uses_keyset_pages(self, fake_db):
+        """Test that pages continue after the last row's (created_at, id) and stop at the limit."""
+        object_storage = ObjectStorage(fake_db)
+        rows = [_adaptation_row(f"adapt-{i}") for i in range(5)]
+        fake_db.fetch_all_results = [rows[0:2], rows[2:4], rows[4:5], rows]
+        fake_db.calls.clear()
+        
+        results = list(object_storage.iter_objects_by_reference("template-1", limit=5, page_size=2))
+        
+        assert [row["id"] for row in results] == [row["id"] for row in rows]
+        reference = '[{"id": "template-1"}]'
+        assert [params for _, _, params in fake_db.calls] == [
+            (reference, 2),
+            (reference, CREATED_AT, "adapt-1", 2),
+            (reference, CREATED_AT, "adapt-3", 1)
+        ]
+        for _, query, _ in fake_db.calls:
+            assert "ORDER BY created_at DESC, id DESC" in query
+            assert "OFFSET" not in query
+    
+    def test_iter_objects_by_reference_stops_on_short_page(self, fake_db):
+        """Test that a page shorter than requested ends the iteration."""
+        object_storage = ObjectStorage(fake_db)
+        fake_db.fetch_all_results = [[_adaptation_row("adapt-1")]]
+        fake_db.calls.clear()
+        
+        results = list(object_storage.iter_objects_by_reference("template-1", page_size=2))
+        
+        assert [row["id"] for row in results] == ["adapt-1"]
+        assert len(fake_db.calls) == 1
+
+
+class TestDatabaseTemplateStorage:
+    """Test cases for DatabaseTemplateStorage."""
+    
+    def test_get_template_adaptation_returns_dict(self, fake_db):
+        """Test that get_template_adaptation returns the template dictionary of the first match."""
+        template_storage = DatabaseTemplateStorage(fake_db)
+        fake_db.fetch_all_results = [[
+            _adaptation_row("adapt-1", site_id="other-site"),
+            _adaptation_row("adapt-2", site_id="site-1")
+        ]]
+        
+        adaptation = template_storage.get_template_adaptation("template-1", site_id="site-1")
+        
+        assert adaptation == {
+            "id": "adapt-2",
+            "name": "Adaptation adapt-2",
+            "template_text": "Hello {name}",
+            "variables": {"name": "str"},
+            "model": "gpt-4o",
+            "temperature": 0.2,
+            "original_template_id": "template-1",
+            "site_id": "site-1",
+            "project_id": None,
+            "created_at": CREATED_AT,
+            "updated_at": CREATED_AT
+        }
+    
+    def test_get_template_adaptation_record(self, fake_db):
+        """Test that the record variant returns an AdaptedTemplate matching the dictionary form."""
+        template_storage = DatabaseTemplateStorage(fake_db)
+        fake_db.fetch_all_results = [[_adaptation_row("adapt-1", project_id="project-1")]]
+        
+        record = template_storage.get_template_adaptation_record("template-1", project_id="project-1")
+        
+        assert isinstance(record, AdaptedTemplate)
+        assert not hasattr(record, "__dict__")
+        assert record.project_id == "project-1"
+        assert record.to_dict()["id"] == "adapt-1"
+    
+    def test_get_template_adaptation_without_match(self, fake_db):
+        """Test that no match, or no site or project, returns None."""
+        template_storage = DatabaseTemplateStorage(fake_db)
+        fake_db.fetch_all_results = [[_adaptation_row("adapt-1", site_id="other-site")]]
+        
+        assert template_storage.get_template_adaptation("template-1", site_id="site-1") is None
+        
+        queries = len(fake_db.calls)
+        assert template_storage.get_template_adaptation("template-1") is None
+        assert len(fake_db.calls) == queries
+    
+    def test_batch_store_template_adaptations(self, fake_db):
+        """Test that a batch fetches the original once and stores each adaptation's metadata."""
+        template_storage = DatabaseTemplateStorage(fake_db)
+        fake_db.objects["template-1"] = {
+            "id": "template-1",
+            "title": "Greeting",
+            "content": {"model": "gpt-4o", "temperature": 0.3},
+            "metadata": {"category": "marketing", "hierarchy_level": 1}
+        }
+        
+        ids = template_storage.batch_store_template_adaptations("template-1", [
+            {"template_text": "Hi {name}", "site_id": "site-1", "version": "2.0"},
+            {"template_text": "Hey {name}", "project_id": "project-1", "temperature": 0.9},
+            {"template_text": "Yo {name}", "site_id": "site-2"}
+        ])
+        
+        assert len(fake_db.calls_to("fetch_one")) == 1
+        batches = fake_db.calls_to("execute_batch")
+        assert len(batches) == 1
+        rows = batches[0][2]
+        assert [row[0] for row in rows] == ids
+        assert len(set(ids)) == 3
+        
+        contents = [row[4] for row in rows]
+        assert [content["temperature"] for content in contents] == [0.3, 0.9, 0.3]
+        assert all(content["original_template_id"] == "template-1" for content in contents)
+        
+        metadata = [row[5] for row in rows]
+        assert [(m["site_id"], m["project_id"]) for m in metadata] == [
+            ("site-1", None), (None, "project-1"), ("site-2", None)
+        ]
+        assert [m["version"] for m in metadata] == ["2.0", "1.0", "1.0"]
+        for m in metadata:
+            assert m["category"] == "marketing"
+            assert m["parent_id"] == "template-1"
+            assert m["hierarchy_level"] == 2
+            assert m["object_type"] == "adapted_prompt_template"
+            assert list(m["tags"]) == ["adapted_template"]
+    
+    def test_batch_store_template_adaptations_missing_original(self, fake_db):
+        """Test that a missing original template raises before anything is stored."""
+        template_storage = DatabaseTemplateStorage(fake_db)
+        
+        with pytest.raises(ValueError):
+            template_storage.batch_store_template_adaptations("missing", [{"site_id": "site-1"}])
+        assert fake_db.calls_to("execute_batch") == []
@@ -2,139 +2,175 @@
 Test module for the with_model_test_mode decorator.
 """
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+import config.settings
 
-from services.models.testing import with_model_test_mode
-from services.models.orchestrator import ModelOrchestrator
+from services.models.testing import with_model_test_mode, close_pooled_orchestrators
+from services.models.testing import decorators
 
 
+@pytest.mark.asyncio
 class TestWithModelTestModeDecorator:
     """Test cases for the with_model_test_mode decorator."""
     
-    @pytest.mark.asyncio
-    async def test_decorator_without_mode(self):
-        """Test the decorator without specifying a mode (defaults to production)."""
-        with patch('services.models.testing.decorators.ModelOrchestrator') as mock_orchestrator_class:
-            # Set up mock orchestrator
-            mock_orchestrator = AsyncMock()
-            mock_orchestrator_class.return_value = mock_orchestrator
-            
-            # Define test function to decorate
-            @with_model_test_mode()
-            async def test_func(orchestrator):
-                return orchestrator.test_mode
-            
-            # Call the decorated function
-            result = await test_func()
-            
-            # Assert orchestrator was created with None test_mode
-            mock_orchestrator_class.assert_called_once_with(test_mode=None)
-            
-            # Assert close was called on orchestrator
-            mock_orchestrator.close.assert_called_once()
+    @pytest.fixture(autouse=True)
+    def empty_pool(self):
+        """Make sure every test starts and ends with an empty orchestrator pool."""
+        decorators._ORCH_POOL.clear()
+        yield
+        decorators._ORCH_POOL.clear()
     
-    @pytest.mark.asyncio
-    async def test_decorator_with_e2e_mode(self):
-        """Test the decorator with e2e test mode."""
-        with patch('services.models.testing.decorators.ModelOrchestrator') as mock_orchestrator_class:
-            # Set up mock orchestrator
-            mock_orchestrator = AsyncMock()
-            mock_orchestrator.test_mode = 'e2e'
-            mock_orchestrator_class.return_value = mock_orchestrator
-            
-            # Define test function to decorate
-            @with_model_test_mode(mode='e2e')
-            async def test_func(orchestrator):
-                return orchestrator.test_mode
-            
-            # Call the decorated function
-            result = await test_func()
-            
-            # Assert result is correct
-            assert result == 'e2e'
-            
-            # Assert orchestrator was created with e2e test_mode
-            mock_orchestrator_class.assert_called_once_with(test_mode='e2e')
-            
-            # Assert close was called on orchestrator
-            mock_orchestrator.close.assert_called_once()
+    @pytest.mark.parametrize("mode", [None, 'e2e', 'mock'])
+    async def test_decorator_mode(self, orchestrator_patch, orchestrator_mock, mode):
+        """Test the decorator without a mode (production) and with each test mode."""
+        # Define test function to decorate
+        decorator = with_model_test_mode(fresh=True) if mode is None else with_model_test_mode(mode=mode, fresh=True)
+        
+        @decorator
+        async def test_func(orchestrator):
+            return orchestrator.test_mode
+        
+        # Call the decorated function
+        result = await test_func()
+        
+        # Assert result is correct
+        assert result == mode
+        
+        # Assert orchestrator was created with the requested test_mode
+        orchestrator_patch.assert_called_once_with(test_mode=mode)
+        
+        # Assert close was called on orchestrator
+        assert orchestrator_mock.close_calls == 1
     
-    @pytest.mark.asyncio
-    async def test_decorator_with_mock_mode(self):
-        """Test the decorator with mock test mode."""
-        with patch('services.models.testing.decorators.ModelOrchestrator') as mock_orchestrator_class:
-            # Set up mock orchestrator
-            mock_orchestrator = AsyncMock()
-            mock_orchestrator.test_mode = 'mock'
-            mock_orchestrator_class.return_value = mock_orchestrator
-            
-            # Define test function to decorate
-            @with_model_test_mode(mode='mock')
-            async def test_func(orchestrator):
-                return orchestrator.test_mode
-            
-            # Call the decorated function
-            result = await test_func()
-            
-            # Assert result is correct
-            assert result == 'mock'
-            
-            # Assert orchestrator was created with mock test_mode
-            mock_orchestrator_class.assert_called_once_with(test_mode='mock')
-            
-            # Assert close was called on orchestrator
-            mock_orchestrator.close.assert_called_once()
-    
-    @pytest.mark.asyncio
-    async def test_decorator_with_exception(self):
+    async def test_decorator_with_exception(self, orchestrator_mock):
         """Test the decorator handles exceptions properly and still closes resources."""
-        with patch('services.models.testing.decorators.ModelOrchestrator') as mock_orchestrator_class:
-            # Set up mock orchestrator
-            mock_orchestrator = AsyncMock()
-            mock_orchestrator_class.return_value = mock_orchestrator
-            
-            # Define test function to decorate that raises an exception
-            @with_model_test_mode(mode='e2e')
-            async def test_func(orchestrator):
-                raise ValueError("Test exception")
-            
-            # Call the decorated function and expect exception
-            with pytest.raises(ValueError) as excinfo:
-                await test_func()
-            
-            # Assert exception message is correct
-            assert "Test exception" in str(excinfo.value)
-            
-            # Assert close was still called on orchestrator (cleanup)
-            mock_orchestrator.close.assert_called_once()
+        # Define test function to decorate that raises an exception
+        @with_model_test_mode(mode='e2e', fresh=True)
+        async def test_func(orchestrator):
+            raise ValueError("Test exception")
+        
+        # Call the decorated function and expect exception
+        with pytest.raises(ValueError) as excinfo:
+            await test_func()
+        
+        # Assert exception message is correct
+        assert "Test exception" in str(excinfo.value)
+        
+        # Assert close was still called on orchestrator (cleanup)
+        assert orchestrator_mock.close_calls == 1
     
-    @pytest.mark.asyncio
-    async def test_decorator_passes_arguments(self):
+    async def test_decorator_passes_arguments(self, orchestrator_mock):
         """Test the decorator passes additional arguments to the wrapped function."""
-        with patch('services.models.testing.decorators.ModelOrchestrator') as mock_orchestrator_class:
-            # Set up mock orchestrator
-            mock_orchestrator = AsyncMock()
-            mock_orchestrator_class.return_value = mock_orchestrator
-            
-            # Define test function to decorate with additional parameters
-            @with_model_test_mode(mode='e2e')
-            async def test_func(orchestrator, arg1, arg2, kwarg1=None, kwarg2=None):
-                return {
-                    'orchestrator_mode': orchestrator.test_mode,
-                    'arg1': arg1,
-                    'arg2': arg2,
-                    'kwarg1': kwarg1,
-                    'kwarg2': kwarg2
-                }
-            
-            # Call the decorated function with arguments
-            result = await test_func("value1", "value2", kwarg1="key1", kwarg2="key2")
-            
-            # Assert result contains all arguments
-            assert result == {
-                'orchestrator_mode': mock_orchestrator.test_mode,
-                'arg1': "value1",
-                'arg2': "value2",
-                'kwarg1': "key1",
-                'kwarg2': "key2"
-            } 
\ No newline at end of file
+        # Define test function to decorate with additional parameters
+        @with_model_test_mode(mode='e2e', fresh=True)
+        async def test_func(orchestrator, arg1, arg2, kwarg1=None, kwarg2=None):
+            return {
+                'orchestrator_mode': orchestrator.test_mode,
+                'arg1': arg1,
+                'arg2': arg2,
+                'kwarg1': kwarg1,
+                'kwarg2': kwarg2
+            }
+        
+        # Call the decorated function with arguments
+        result = await test_func("value1", "value2", kwarg1="key1", kwarg2="key2")
+        
+        # Assert result contains all arguments
+        assert result == {
+            'orchestrator_mode': 'e2e',
+            'arg1': "value1",
+            'arg2': "value2",
+            'kwarg1': "key1",
+            'kwarg2': "key2"
+        }
+    
+    async def test_decorator_reuses_pooled_orchestrator(self, orchestrator_patch, orchestrator_mock):
+        """Test that calls with fresh=False share one orchestrator per mode."""
+        @with_model_test_mode(mode='mock', fresh=False)
+        async def test_func(orchestrator):
+            return orchestrator
+        
+        # Call the decorated function twice
+        first = await test_func()
+        second = await test_func()
+        
+        # Assert the orchestrator was created once and is still open
+        assert first is second is orchestrator_mock
+        orchestrator_patch.assert_called_once_with(test_mode='mock')
+        assert orchestrator_mock.close_calls == 0
+        
+        # Closing the pool closes the orchestrator and empties the pool
+        await close_pooled_orchestrators()
+        assert orchestrator_mock.close_calls == 1
+        assert decorators._ORCH_POOL == {}
+    
+    async def test_close_pooled_orchestrators_closes_every_mode(self, monkeypatch):
+        """Test that closing the pool closes one orchestrator per mode and later calls start a new pool."""
+        created = []
+        
+        class RecordingOrchestrator:
+            """Records each construction and close."""
+            
+            def __init__(self, test_mode=None):
+                self.test_mode = test_mode
+                self.closed = False
+                created.append(self)
+            
+            async def close(self):
+                self.closed = True
+        
+        monkeypatch.setattr(decorators, "ModelOrchestrator", RecordingOrchestrator, raising=False)
+        
+        @with_model_test_mode(mode='mock', fresh=False)
+        async def mock_func(orchestrator):
+            return orchestrator
+        
+        @with_model_test_mode(mode='e2e', fresh=False)
+        async def e2e_func(orchestrator):
+            return orchestrator
+        
+        assert await mock_func() is await mock_func()
+        assert await e2e_func() is not await mock_func()
+        assert [orchestrator.test_mode for orchestrator in created] == ['mock', 'e2e']
+        
+        await close_pooled_orchestrators()
+        assert all(orchestrator.closed for orchestrator in created)
+        assert decorators._ORCH_POOL == {}
+        
+        # The next pooled call builds a new orchestrator
+        assert await mock_func() is created[2]
+        assert created[2].closed is False
+    
+    @pytest.mark.parametrize("fresh", [True, False])
+    async def test_test_mode_restored_between_calls(self, monkeypatch, fresh):
+        """Test that a None-mode call after an e2e call does not run in e2e mode."""
+        class SettingsOrchestrator:
+            """Sets and restores the global test mode like ModelOrchestrator."""
+            
+            def __init__(self, test_mode=None):
+                self.previous_test_mode = config.settings.TEST_MODE
+                if test_mode:
+                    config.settings.TEST_MODE = test_mode
+                self.test_mode = test_mode
+            
+            async def close(self):
+                config.settings.TEST_MODE = self.previous_test_mode
+        
+        monkeypatch.setattr(decorators, "ModelOrchestrator", SettingsOrchestrator, raising=False)
+        monkeypatch.setattr(config.settings, "TEST_MODE", None)
+        
+        @with_model_test_mode(mode='e2e', fresh=fresh)
+        async def e2e_func(orchestrator):
+            return config.settings.TEST_MODE
+        
+        @with_model_test_mode(fresh=fresh)
+        async def default_func(orchestrator):
+            return config.settings.TEST_MODE
+        
+        # The e2e call runs in e2e mode, the following call does not
+        assert await e2e_func() == 'e2e'
+        assert await default_func() is None
+        assert config.settings.TEST_MODE is None
+        
+        # Closing the pool leaves the global test mode untouched
+        await close_pooled_orchestrators()
+        assert config.settings.TEST_MODE is None
@@ -4,183 +4,136 @@ Tests for the ModelValidator class.
 
 import pytest
 from datetime import datetime
+from enum import IntEnum
 from typing import Dict, Any, List
 
+from services.models.core.base_model import BaseModel, FieldDefinition
 from services.models.validation import ModelValidator, ValidationResult
-from services.models.validation.type_validators import TypeValidator
+from services.models.validation.type_validators import TypeValidator, _BASIC_TYPE_NAMES
+
+
+# (value, type string, expected validity, expected error substring) cases for TypeValidator
+TYPE_VALIDATION_CASES = [
+    pytest.param("test", "str", True, "", id="str-valid"),
+    pytest.param(123, "str", False, "expected string", id="str-invalid"),
+    pytest.param(123, "int", True, "", id="int-valid"),
+    pytest.param("test", "int", False, "expected integer", id="int-invalid"),
+    pytest.param(True, "int", False, "expected integer", id="int-rejects-bool"),
+    pytest.param(123.45, "float", True, "", id="float-valid"),
+    pytest.param(123, "float", True, "", id="float-accepts-int"),
+    pytest.param("test", "float", False, "expected number", id="float-invalid"),
+    pytest.param(True, "bool", True, "", id="bool-valid"),
+    pytest.param(1, "bool", False, "expected boolean", id="bool-invalid"),
+    pytest.param(datetime(2023, 1, 1, 12, 0), "datetime", True, "", id="datetime-object"),
+    pytest.param("2023-01-01T12:00:00", "datetime", True, "", id="datetime-string"),
+    pytest.param("not a date", "datetime", False, "invalid datetime format", id="datetime-invalid-format"),
+    pytest.param(123, "datetime", False, "expected datetime", id="datetime-invalid-type"),
+    pytest.param(["a", "b", "c"], "List[str]", True, "", id="list-valid"),
+    pytest.param("not a list", "List[str]", False, "expected list", id="list-not-a-list"),
+    pytest.param(["a", 123, "c"], "List[str]", False, "invalid item", id="list-invalid-item"),
+    pytest.param({"a": 1, "b": 2}, "Dict[str, int]", True, "", id="dict-valid"),
+    pytest.param("not a dict", "Dict[str, int]", False, "expected dictionary", id="dict-not-a-dict"),
+    pytest.param({1: 1, 2: 2}, "Dict[str, int]", False, "invalid key", id="dict-invalid-key"),
+    pytest.param({"a": "1", "b": "2"}, "Dict[str, int]", False, "invalid value", id="dict-invalid-value"),
+    pytest.param("test", "Union[str, int]", True, "", id="union-first-type"),
+    pytest.param(123, "Union[str, int]", True, "", id="union-second-type"),
+    pytest.param(True, "Union[str, int]", False, "value did not match any of the expected types", id="union-invalid"),
+    pytest.param([1], "Union[str, int, List[int]]", True, "", id="union-last-type"),
+    pytest.param(1.5, "Union[str, int]", False, "expected string, got float, expected integer, got float", id="union-errors-in-order"),
+    pytest.param("test", "Optional[str]", True, "", id="optional-value"),
+    pytest.param(None, "Optional[str]", True, "", id="optional-none"),
+    pytest.param(123, "Optional[str]", False, "expected string", id="optional-invalid"),
+    pytest.param([1, "a", None], "List[Any]", True, "", id="list-of-any"),
+    pytest.param({"a": 1, "b": [2]}, "Dict[str, Any]", True, "", id="dict-any-values"),
+    pytest.param({1: "a"}, "Dict[str, Any]", False, "invalid key", id="dict-any-values-invalid-key"),
+    pytest.param({"a": [1, 2]}, "Dict[str, List[int]]", True, "", id="dict-nested-list"),
+    pytest.param({"a": {"b": "c"}}, "Dict[str, Dict[str, int]]", False, "invalid value for key 'a': invalid value for key 'b': expected integer, got str", id="dict-nested-dict-invalid"),
+    pytest.param([[1], [2, "x"]], "List[List[int]]", False, "invalid item at index 1: invalid item at index 1: expected integer, got str", id="list-nested-invalid"),
+    pytest.param({"a": 1}, "Union[List[str], Dict[str, int]]", True, "", id="union-nested-types"),
+    pytest.param({1, 2}, "Set[int]", False, "unsupported type: Set[int]", id="unsupported"),
+]
+
+
+@pytest.fixture(scope="module")
+def type_validator():
+    """Share one TypeValidator across the module; it holds no state."""
+    return TypeValidator()
 
 
 class TestTypeValidator:
     """Tests for the TypeValidator class."""
     
-    def test_validate_string(self):
-        """Test string type validation."""
-        validator = TypeValidator()
-        
-        # Valid string
-        is_valid, error = validator.validate_type("test", "str")
-        assert is_valid is True
-        assert error == ""
-        
-        # Invalid string
-        is_valid, error = validator.validate_type(123, "str")
-        assert is_valid is False
-        assert "expected string" in error
-    
-    def test_validate_int(self):
-        """Test integer type validation."""
-        validator = TypeValidator()
-        
-        # Valid int
-        is_valid, error = validator.validate_type(123, "int")
-        assert is_valid is True
-        assert error == ""
-        
-        # Invalid int
-        is_valid, error = validator.validate_type("test", "int")
-        assert is_valid is False
-        assert "expected integer" in error
-        
-        # Boolean is not an int
-        is_valid, error = validator.validate_type(True, "int")
-        assert is_valid is False
-        assert "expected integer" in error
-    
-    def test_validate_float(self):
-        """Test float type validation."""
-        validator = TypeValidator()
-        
-        # Valid float
-        is_valid, error = validator.validate_type(123.45, "float")
-        assert is_valid is True
-        assert error == ""
-        
-        # Int is also valid
-        is_valid, error = validator.validate_type(123, "float")
-        assert is_valid is True
-        assert error == ""
-        
-        # Invalid float
-        is_valid, error = validator.validate_type("test", "float")
-        assert is_valid is False
-        assert "expected number" in error
+    @pytest.mark.parametrize("value,type_str,expected_valid,error_substring", TYPE_VALIDATION_CASES)
+    def test_validate_type(self, type_validator, value, type_str, expected_valid, error_substring):
+        """Test validating a value against a type string."""
+        is_valid, error = type_validator.validate_type(value, type_str)
+        assert is_valid is expected_valid
+        if expected_valid:
+            assert error == ""
+        else:
+            assert error_substring in error
     
-    def test_validate_bool(self):
-        """Test boolean type validation."""
-        validator = TypeValidator()
-        
-        # Valid boolean
-        is_valid, error = validator.validate_type(True, "bool")
-        assert is_valid is True
-        assert error == ""
-        
-        # Invalid boolean
-        is_valid, error = validator.validate_type(1, "bool")
-        assert is_valid is False
-        assert "expected boolean" in error
+    def test_strict_types_rejects_subclasses(self, type_validator):
+        """Test that int subclasses pass by default and fail with strict_types."""
+        class Level(IntEnum):
+            LOW = 1
+        
+        assert type_validator.validate_type(Level.LOW, "int") == (True, "")
+        assert type_validator.validate_type(Level.LOW, "float") == (True, "")
+        
+        strict = TypeValidator(strict_types=True)
+        assert strict.validate_type(Level.LOW, "int") == (False, "expected integer, got Level")
+        assert strict.validate_type(Level.LOW, "float") == (False, "expected number, got Level")
+        assert strict.validate_type(1, "int") == (True, "")
     
-    def test_validate_datetime(self):
-        """Test datetime type validation."""
-        validator = TypeValidator()
-        
-        # Valid datetime as object
-        is_valid, error = validator.validate_type(datetime.now(), "datetime")
-        assert is_valid is True
-        assert error == ""
-        
-        # Valid datetime as string
-        is_valid, error = validator.validate_type("2023-01-01T12:00:00", "datetime")
-        assert is_valid is True
-        assert error == ""
-        
-        # Invalid datetime format
-        is_valid, error = validator.validate_type("not a date", "datetime")
-        assert is_valid is False
-        assert "invalid datetime format" in error
-        
-        # Invalid datetime type
-        is_valid, error = validator.validate_type(123, "datetime")
-        assert is_valid is False
-        assert "expected datetime" in error
+    def test_basic_dispatch_matches_parser(self, type_validator):
+        """Test that every basic type name the parser recognizes has a dispatch entry."""
+        assert set(type_validator._basic_dispatch) == _BASIC_TYPE_NAMES
+
+
+class TestValidationResult:
+    """Tests for the ValidationResult class."""
     
-    def test_validate_list(self):
-        """Test list type validation."""
-        validator = TypeValidator()
-        
-        # Valid list of strings
-        is_valid, error = validator.validate_type(["a", "b", "c"], "List[str]")
-        assert is_valid is True
-        assert error == ""
+    def test_is_valid_follows_errors(self):
+        """Test that is_valid is derived from the recorded errors and explicit marking."""
+        result = ValidationResult()
+        assert result.is_valid is True
         
-        # Invalid list (not a list)
-        is_valid, error = validator.validate_type("not a list", "List[str]")
-        assert is_valid is False
-        assert "expected list" in error
+        result.add_error("name", "bad name")
+        result.add_error("age", "bad age")
+        assert result.is_valid is False
+        assert [error["path"] for error in result.errors] == ["name", "age"]
         
-        # Invalid list contents
-        is_valid, error = validator.validate_type(["a", 123, "c"], "List[str]")
-        assert is_valid is False
-        assert "invalid item" in error
+        assert ValidationResult(is_valid=False).is_valid is False
     
-    def test_validate_dict(self):
-        """Test dictionary type validation."""
-        validator = TypeValidator()
-        
-        # Valid dict
-        is_valid, error = validator.validate_type({"a": 1, "b": 2}, "Dict[str, int]")
-        assert is_valid is True
-        assert error == ""
-        
-        # Invalid dict (not a dict)
-        is_valid, error = validator.validate_type("not a dict", "Dict[str, int]")
-        assert is_valid is False
-        assert "expected dictionary" in error
-        
-        # Invalid key type
-        is_valid, error = validator.validate_type({1: 1, 2: 2}, "Dict[str, int]")
-        assert is_valid is False
-        assert "invalid key" in error
-        
-        # Invalid value type
-        is_valid, error = validator.validate_type({"a": "1", "b": "2"}, "Dict[str, int]")
-        assert is_valid is False
-        assert "invalid value" in error
+    def test_errors_built_from_tuples(self):
+        """Test that errors given as tuples or dictionaries read back as dictionaries."""
+        result = ValidationResult(errors=[("name", "bad name", "invalid")])
+        result.add_error("age", "bad age", "type")
+        
+        expected = [
+            {"path": "name", "message": "bad name", "code": "invalid"},
+            {"path": "age", "message": "bad age", "code": "type"},
+        ]
+        assert result.errors == expected
+        assert result.errors is result.errors
+        assert ValidationResult(errors=expected).as_dicts() == expected
     
-    def test_validate_union(self):
-        """Test union type validation."""
-        validator = TypeValidator()
-        
-        # Union of str and int
-        is_valid, error = validator.validate_type("test", "Union[str, int]")
-        assert is_valid is True
-        assert error == ""
-        
-        is_valid, error = validator.validate_type(123, "Union[str, int]")
-        assert is_valid is True
-        assert error == ""
-        
-        # Invalid for union
-        is_valid, error = validator.validate_type(True, "Union[str, int]")
-        assert is_valid is False
-        assert "value did not match any of the expected types" in error
-    
-    def test_validate_optional(self):
-        """Test optional type validation."""
-        validator = TypeValidator()
+    def test_errors_list_changes_are_kept(self):
+        """Test that errors appended to the list directly are kept and make the result invalid."""
+        result = ValidationResult()
+        assert result.errors == []
         
-        # Optional string
-        is_valid, error = validator.validate_type("test", "Optional[str]")
-        assert is_valid is True
-        assert error == ""
+        result.errors.append({"path": "name", "message": "bad name", "code": "invalid"})
+        assert result.is_valid is False
         
-        is_valid, error = validator.validate_type(None, "Optional[str]")
-        assert is_valid is True
-        assert error == ""
+        result.add_error("age", "bad age")
+        assert [error["path"] for error in result.errors] == ["name", "age"]
+        assert result.as_dicts() == result.errors
         
-        # Invalid for optional string
-        is_valid, error = validator.validate_type(123, "Optional[str]")
-        assert is_valid is False
-        assert "expected string" in error
+        result.errors = []
+        assert result.errors == []
+        assert result.is_valid is True
 
 
 class TestModelValidator:
@@ -226,6 +179,12 @@ class TestModelValidator:
         assert result.is_valid is True
         assert result.errors == []
         assert result.validated_data == data
+        assert result.validated_data is data
+        
+        # Copy requested
+        result = validator.validate_against_model(data, model_schema, copy_on_success=True)
+        assert result.validated_data == data
+        assert result.validated_data is not data
         
         # Missing required field
         data = {
@@ -278,4 +237,70 @@ class TestModelValidator:
         result = validator.validate_against_model(data, model_schema, partial=True)
         assert result.is_valid is True
         assert result.errors == []
-        assert result.validated_data == data 
\ No newline at end of file
+        assert result.validated_data == data
+    
+    def test_type_validator_injection(self):
+        """Test that validators share the default TypeValidator unless one is injected."""
+        assert ModelValidator().type_validator is ModelValidator().type_validator
+        
+        custom = TypeValidator()
+        assert ModelValidator(type_validator=custom).type_validator is custom
+    
+    def test_custom_validators(self):
+        """Test that custom validator code runs on each validation and reports failures."""
+        validator = ModelValidator()
+        model_schema = {
+            "model_name": "TestModel",
+            "fields": {"age": {"name": "age", "type": "int", "required": True}},
+            "validators": [
+                {
+                    "name": "adult",
+                    "code": "if data['age'] < 18:\n    raise ValueError('must be an adult')"
+                }
+            ]
+        }
+        
+        assert validator.validate_against_model({"age": 30}, model_schema).is_valid is True
+        
+        result = validator.validate_against_model({"age": 12}, model_schema)
+        assert result.is_valid is False
+        assert "Validator adult failed: must be an adult" in result.errors[0]["message"]
+    
+    def test_custom_validators_do_not_share_globals(self):
+        """Test that a global set by one custom validator is not visible to the next."""
+        validator = ModelValidator()
+        model_schema = {
+            "model_name": "TestModel",
+            "fields": {"age": {"name": "age", "type": "int", "required": True}},
+            "validators": [
+                {"name": "remember", "code": "global seen\nseen = data['age']"},
+                {"name": "recall", "code": "seen"}
+            ]
+        }
+        
+        result = validator.validate_against_model({"age": 30}, model_schema)
+        assert result.is_valid is False
+        assert [error["message"] for error in result.errors] == [
+            "Validator recall failed: name 'seen' is not defined"
+        ]
+    
+    def test_validate_with_model_class_caches_schema(self):
+        """Test that a model class is converted to a schema only once."""
+        class CountingModel(BaseModel):
+            model_name = "counting_model"
+            schema_calls = 0
+            
+            @classmethod
+            def get_fields(cls):
+                return {"name": FieldDefinition("name", "str", True)}
+            
+            @classmethod
+            def to_schema(cls):
+                cls.schema_calls += 1
+                return super().to_schema()
+        
+        validator = ModelValidator()
+        assert validator.validate_with_model_class({"name": "a"}, CountingModel).is_valid is True
+        assert validator.validate_with_model_class({"name": 1}, CountingModel).is_valid is False
+        assert ModelValidator().validate_with_model_class({"name": "b"}, CountingModel).is_valid is True
+        assert CountingModel.schema_calls == 1
@@ -0,0 +1,110 @@
+"""
+Test module for the mock VectorObjectStorage and its embedding index.
+"""
+import pytest
+
+from services.models.storage.vector_storage import VectorObjectStorage
+
+
+@pytest.fixture
+def storage():
+    """Fresh mock vector storage for each test."""
+    return VectorObjectStorage()
+
+
+async def _store_abc(storage):
+    """Store entries a, b and c with embeddings along x, between x and y, and along y."""
+    await storage.store_content_vectors("a", {"n": 1}, {"lang": "en"}, "doc", embedding=[1.0, 0.0])
+    await storage.store_content_vectors("b", {"n": 2}, {"lang": "fr"}, "doc", embedding=[1.0, 1.0])
+    await storage.store_content_vectors("c", {"n": 3}, {"lang": "en"}, "note", embedding=[0.0, 1.0])
+
+
+def _ids(results):
+    """Return the IDs of search results in order."""
+    return [result["id"] for result in results]
+
+
+@pytest.mark.asyncio
+class TestVectorObjectStorage:
+    """Test cases for VectorObjectStorage similarity search."""
+    
+    async def test_store_overwrites_embedding(self, storage):
+        """Test that storing an ID again replaces its embedding instead of adding a row."""
+        await storage.store_content_vectors("a", {"n": 1}, embedding=[1.0, 0.0])
+        await storage.store_content_vectors("a", {"n": 2}, embedding=[0.0, 2.0])
+        
+        results = await storage.search_similar_content("q", query_embedding=[0.0, 1.0])
+        
+        assert _ids(results) == ["a"]
+        assert results[0]["content"] == {"n": 2}
+        assert results[0]["score"] == pytest.approx(1.0)
+    
+    async def test_store_without_embedding_drops_old_embedding(self, storage):
+        """Test that re-storing an ID without an embedding removes it from search."""
+        await _store_abc(storage)
+        await storage.store_content_vectors("a", {"n": 1})
+        
+        results = await storage.search_similar_content("q", query_embedding=[1.0, 0.0])
+        
+        assert _ids(results) == ["b", "c"]
+        assert await storage.get_content_vectors("a") is not None
+    
+    async def test_top_k_ordering_with_limit_above_count(self, storage):
+        """Test that results are sorted by similarity and capped at the number of entries."""
+        await _store_abc(storage)
+        
+        results = await storage.search_similar_content("q", limit=10, query_embedding=[1.0, 0.1])
+        
+        assert _ids(results) == ["a", "b", "c"]
+        scores = [result["score"] for result in results]
+        assert scores == sorted(scores, reverse=True)
+        
+        top = await storage.search_similar_content("q", limit=2, query_embedding=[0.1, 1.0])
+        assert _ids(top) == ["c", "b"]
+    
+    @pytest.mark.parametrize("deleted, remaining", [("b", ["a", "c"]), ("c", ["a", "b"])])
+    async def test_delete_middle_and_last_rows(self, storage, deleted, remaining):
+        """Test that deleting the middle or the last row keeps the other rows searchable."""
+        await _store_abc(storage)
+        assert await storage.delete_content_vectors(deleted) is True
+        
+        results = await storage.search_similar_content("q", limit=10, query_embedding=[1.0, 1.0])
+        
+        assert sorted(_ids(results)) == remaining
+        assert await storage.delete_content_vectors(deleted) is False
+        
+        # The index keeps working for new entries after the removal
+        await storage.store_content_vectors("d", {"n": 4}, embedding=[-1.0, -1.0])
+        results = await storage.search_similar_content("q", limit=1, query_embedding=[-1.0, -1.0])
+        assert _ids(results) == ["d"]
+    
+    async def test_filters(self, storage):
+        """Test content type and metadata filters select the candidates."""
+        await _store_abc(storage)
+        
+        by_type = await storage.search_similar_content("q", content_type="doc", query_embedding=[0.0, 1.0])
+        assert _ids(by_type) == ["b", "a"]
+        
+        by_metadata = await storage.search_similar_content(
+            "q", metadata_filters={"lang": "en"}, query_embedding=[1.0, 0.0]
+        )
+        assert _ids(by_metadata) == ["a", "c"]
+        
+        no_match = await storage.search_similar_content(
+            "q", content_type="note", metadata_filters={"lang": "fr"}, query_embedding=[1.0, 0.0]
+        )
+        assert no_match == []
+    
+    async def test_bad_embedding_leaves_storage_unchanged(self, storage):
+        """Test that an embedding of the wrong dimension is rejected before anything is stored."""
+        await _store_abc(storage)
+        
+        with pytest.raises(ValueError):
+            await storage.store_content_vectors("a", {"n": 99}, embedding=[1.0, 0.0, 0.0])
+        with pytest.raises(ValueError):
+            await storage.store_content_vectors("e", {"n": 5}, embedding=[1.0])
+        
+        assert (await storage.get_content_vectors("a"))["content"] == {"n": 1}
+        assert await storage.get_content_vectors("e") is None
+        results = await storage.search_similar_content("q", limit=10, query_embedding=[1.0, 0.0])
+        assert _ids(results) == ["a", "b", "c"]
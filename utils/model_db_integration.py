@@ -6,6 +6,7 @@ DEPENDENCIES:
     - services.models.orchestrator: Model management
     - services.database.db_operator: Database operations
     - asyncio: For async runtime
+    - orjson (optional): For fast parsing and printing of CLI JSON
 
 This utility script provides examples of common operations that integrate
 model validation and database operations, showing how to effectively use
@@ -16,12 +17,19 @@ import asyncio
 import logging
 import argparse
 import json
-from typing import Any, Dict, List, Optional, Union
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 
 from services.models import orchestrator
 from services.models.db_schema_inspector import SchemaInspector
 from services.database.db_operator import DBOperator
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -30,10 +38,81 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=128)
+def _build_insert_sql(schema: str, table: str, cols: Tuple[str, ...]) -> str:
+    """
+    Build a parameterized INSERT statement, cached per schema, table and column set.
+    
+    Args:
+        schema: Database schema name
+        table: Table name
+        cols: Column names, in the order their values will be bound
+        
+    Returns:
+        INSERT ... RETURNING id statement with $n placeholders
+    """
+    placeholders = ', '.join(f'${i}' for i in range(1, len(cols) + 1))
+    return f"INSERT INTO {schema}.{table} ({', '.join(cols)}) VALUES ({placeholders}) RETURNING id"
+
+
+@lru_cache(maxsize=128)
+def _build_select_sql(schema: str, table: str, cols: Tuple[str, ...]) -> str:
+    """
+    Build the by-ID SELECT for a model, projecting only the given columns.
+    
+    Args:
+        schema: Database schema name
+        table: Table name
+        cols: Column names to project; empty selects every column
+        
+    Returns:
+        SELECT ... WHERE id = $1 statement
+    """
+    projection = ', '.join(cols) if cols else '*'
+    return f"SELECT {projection} FROM {schema}.{table} WHERE id = $1"
+
+
+def _table_name(model: Dict[str, Any], model_name: str) -> str:
+    """Return the table of a model schema, defaulting to the lowercased model name."""
+    return model.get("table_name", model_name.lower())
+
+
+def _loads(data: str) -> Any:
+    """Parse CLI JSON input, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(result: Dict[str, Any]) -> str:
+    """Format a command result as indented JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(result, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(result, indent=2)
+
+
+@asynccontextmanager
+async def db_session() -> AsyncIterator[DBOperator]:
+    """
+    Open one DBOperator to share across several calls and close it on exit.
+    
+    Usage:
+        async with db_session() as db:
+            for record in records:
+                await validate_and_insert("my_model", record, db=db)
+    """
+    db = DBOperator()
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
 async def validate_and_insert(
     model_name: str, 
     data: Dict[str, Any], 
-    schema: str = "public"
+    schema: str = "public",
+    db: Optional[DBOperator] = None
 ) -> Dict[str, Any]:
     """
     Validate data against a model and insert it into the database.
@@ -42,6 +121,8 @@ async def validate_and_insert(
         model_name: Name of the model to validate against
         data: Data to validate and insert
         schema: Database schema to use
+        db: Optional open DBOperator to reuse; when omitted a new one is
+            created and closed for this call
         
     Returns:
         Dict containing the result of the operation
@@ -64,28 +145,25 @@ async def validate_and_insert(
             "message": f"Model '{model_name}' not found"
         }
     
-    table_name = model.get_table_name()
+    table_name = _table_name(model, model_name)
     
     # Step 3: Insert data into the database
-    db = DBOperator()
+    owns_db = db is None
+    if owns_db:
+        db = DBOperator()
     try:
         # Clean data for database insertion (remove any fields not in the model)
         clean_data = validation_result.valid_data
         
-        query = f"""
-        INSERT INTO {schema}.{table_name} 
-        ({', '.join(clean_data.keys())})
-        VALUES ({', '.join(['$' + str(i+1) for i in range(len(clean_data))])})
-        RETURNING id
-        """
-        
+        # Sort the columns so callers passing keys in any order share one cached statement
+        cols = tuple(sorted(clean_data))
         result = await db.execute(
-            query, 
-            values=list(clean_data.values()),
+            _build_insert_sql(schema, table_name, cols), 
+            values=[clean_data[col] for col in cols],
             return_rows=True
         )
         
-        if result and len(result) > 0:
+        if result:
             return {
                 "success": True,
                 "id": result[0]["id"],
@@ -97,19 +175,21 @@ async def validate_and_insert(
                 "message": "Insert operation did not return an ID"
             }
     except Exception as e:
-        logger.exception(f"Database error during insertion: {str(e)}")
+        logger.exception("Database error during insertion into %s.%s", schema, table_name)
         return {
             "success": False,
             "message": f"Database error: {str(e)}"
         }
     finally:
-        await db.close()
+        if owns_db:
+            await db.close()
 
 
 async def fetch_and_validate(
     model_name: str, 
     record_id: int, 
-    schema: str = "public"
+    schema: str = "public",
+    db: Optional[DBOperator] = None
 ) -> Dict[str, Any]:
     """
     Fetch data from the database and validate it against a model.
@@ -118,9 +198,13 @@ async def fetch_and_validate(
         model_name: Name of the model to validate against
         record_id: ID of the record to fetch
         schema: Database schema to use
+        db: Optional open DBOperator to reuse; when omitted a new one is
+            created and closed for this call
         
     Returns:
-        Dict containing the result of the operation
+        Dict containing the result of the operation; its "data" holds the
+        record's id and the columns the model declares, not every column
+        of the table
     """
     # Step 1: Get the table name for the model
     model = await orchestrator.get_model(model_name)
@@ -130,12 +214,16 @@ async def fetch_and_validate(
             "message": f"Model '{model_name}' not found"
         }
     
-    table_name = model.get_table_name()
+    table_name = _table_name(model, model_name)
     
     # Step 2: Fetch data from the database
-    db = DBOperator()
+    owns_db = db is None
+    if owns_db:
+        db = DBOperator()
     try:
-        query = f"SELECT * FROM {schema}.{table_name} WHERE id = $1"
+        # Fetch the id and the columns the model declares; validation would ignore the rest
+        cols = ("id",) + tuple(name for name in model.get("fields", {}) if name != "id")
+        query = _build_select_sql(schema, table_name, cols)
         result = await db.execute(query, values=[record_id], return_rows=True)
         
         if not result or len(result) == 0:
@@ -163,19 +251,120 @@ async def fetch_and_validate(
                 "message": "Fetched data failed validation"
             }
     except Exception as e:
-        logger.exception(f"Error during fetch and validate: {str(e)}")
+        logger.exception("Error during fetch and validate for model %s", model_name)
         return {
             "success": False,
             "message": f"Error: {str(e)}"
         }
     finally:
-        await db.close()
+        if owns_db:
+            await db.close()
+
+
+async def _repair_missing_columns(
+    db: DBOperator,
+    model_name: str,
+    result: Dict[str, Any],
+    schema: str
+) -> Dict[str, Any]:
+    """
+    Add the columns reported missing by schema verification to an existing table.
+    
+    Args:
+        db: Open DBOperator to run the ALTER TABLE on
+        model_name: Name of the model being repaired
+        result: Result of SchemaInspector.verify_model_schema
+        schema: Database schema to use
+        
+    Returns:
+        Dict containing the result of the operation
+    """
+    try:
+        model = await orchestrator.get_model(model_name)
+        if not model:
+            return {
+                "success": False,
+                "message": f"Model '{model_name}' not found"
+            }
+        
+        # Look up the definitions of the missing columns
+        column_defs = [
+            (column, model.get_field_db_definition(column))
+            for column in result["missing_columns"]
+        ]
+        add_clauses = [
+            f"ADD COLUMN {column} {column_def['type']}"
+            for column, column_def in column_defs
+            if column_def
+        ]
+        
+        # Add every column in one ALTER TABLE (one round-trip and one lock)
+        if add_clauses:
+            await db.execute(
+                f"ALTER TABLE {schema}.{result['table_name']} "
+                f"{', '.join(add_clauses)}"
+            )
+            
+        return {
+            "success": True,
+            "message": f"Added missing columns to {schema}.{result['table_name']}",
+            "columns_added": result["missing_columns"]
+        }
+    except Exception as e:
+        logger.exception("Error during schema repair for model %s", model_name)
+        return {
+            "success": False,
+            "message": f"Error during schema repair: {str(e)}"
+        }
+
+
+async def _create_table_from_schema(
+    db: DBOperator,
+    inspector: SchemaInspector,
+    model_name: str,
+    schema: str
+) -> Dict[str, Any]:
+    """
+    Create the table for a model that has no table yet.
+    
+    Args:
+        db: Open DBOperator to run the CREATE TABLE on
+        inspector: SchemaInspector used to generate the table SQL
+        model_name: Name of the model whose table to create
+        schema: Database schema to use
+        
+    Returns:
+        Dict containing the result of the operation
+    """
+    sql_result = await inspector.generate_schema_sql(model_name)
+    if sql_result.get("error"):
+        return {
+            "success": False,
+            "message": sql_result["error"]
+        }
+    
+    try:
+        create_statement = sql_result["create_table_sql"].replace("{schema}", schema)
+        await db.execute(create_statement)
+        
+        return {
+            "success": True,
+            "message": f"Created table {schema}.{sql_result['table_name']}",
+            "sql": create_statement
+        }
+    except Exception as e:
+        logger.exception("Error during table creation for model %s", model_name)
+        return {
+            "success": False,
+            "message": f"Error during table creation: {str(e)}"
+        }
 
 
 async def verify_and_repair_schema(
     model_name: str, 
     schema: str = "public",
-    auto_repair: bool = False
+    auto_repair: bool = False,
+    db: Optional[DBOperator] = None
 ) -> Dict[str, Any]:
     """
     Verify a model's schema against the database and optionally repair it.
@@ -184,6 +373,8 @@ async def verify_and_repair_schema(
         model_name: Name of the model to verify
         schema: Database schema to use
         auto_repair: Whether to automatically repair the schema
+        db: Optional open DBOperator to reuse; when omitted a new one is
+            created and closed for this call
         
     Returns:
         Dict containing the result of the operation
@@ -205,84 +396,28 @@ async def verify_and_repair_schema(
                 "message": f"Model '{model_name}' schema is valid"
             }
         
-        # Step 2: If auto_repair is True and the schema is invalid, repair it
-        if auto_repair:
-            if result["table_exists"]:
-                # If the table exists but has missing columns, add them
-                if result["missing_columns"]:
-                    db = DBOperator()
-                    try:
-                        model = await orchestrator.get_model(model_name)
-                        if not model:
-                            return {
-                                "success": False,
-                                "message": f"Model '{model_name}' not found"
-                            }
-                        
-                        # Generate ALTER TABLE statements for missing columns
-                        alter_statements = []
-                        for column in result["missing_columns"]:
-                            column_def = model.get_field_db_definition(column)
-                            if column_def:
-                                alter_statements.append(
-                                    f"ALTER TABLE {schema}.{result['table_name']} "
-                                    f"ADD COLUMN {column} {column_def['type']}"
-                                )
-                        
-                        # Execute ALTER TABLE statements
-                        for statement in alter_statements:
-                            await db.execute(statement)
-                            
-                        return {
-                            "success": True,
-                            "message": f"Added missing columns to {schema}.{result['table_name']}",
-                            "columns_added": result["missing_columns"]
-                        }
-                    except Exception as e:
-                        logger.exception(f"Error during schema repair: {str(e)}")
-                        return {
-                            "success": False,
-                            "message": f"Error during schema repair: {str(e)}"
-                        }
-                    finally:
-                        await db.close()
-            else:
-                # If the table doesn't exist, create it
-                sql_result = await inspector.generate_schema_sql(model_name)
-                if sql_result.get("error"):
-                    return {
-                        "success": False,
-                        "message": sql_result["error"]
-                    }
-                
-                db = DBOperator()
-                try:
-                    create_statement = sql_result["create_table_sql"].replace("{schema}", schema)
-                    await db.execute(create_statement)
-                    
-                    return {
-                        "success": True,
-                        "message": f"Created table {schema}.{sql_result['table_name']}",
-                        "sql": create_statement
-                    }
-                except Exception as e:
-                    logger.exception(f"Error during table creation: {str(e)}")
-                    return {
-                        "success": False,
-                        "message": f"Error during table creation: {str(e)}"
-                    }
-                finally:
-                    await db.close()
+        # Without auto_repair, or with only type mismatches to fix, report the issues
+        if not auto_repair or (result["table_exists"] and not result["missing_columns"]):
+            return {
+                "success": False,
+                "issues": {
+                    "missing_columns": result["missing_columns"],
+                    "type_mismatches": result["type_mismatches"]
+                },
+                "message": f"Model '{model_name}' schema is invalid"
+            }
         
-        # If auto_repair is False, just return the verification result
-        return {
-            "success": False,
-            "issues": {
-                "missing_columns": result["missing_columns"],
-                "type_mismatches": result["type_mismatches"]
-            },
-            "message": f"Model '{model_name}' schema is invalid"
-        }
+        # Step 2: Repair the schema on a single database connection
+        owns_db = db is None
+        if owns_db:
+            db = DBOperator()
+        try:
+            if result["table_exists"]:
+                return await _repair_missing_columns(db, model_name, result, schema)
+            return await _create_table_from_schema(db, inspector, model_name, schema)
+        finally:
+            if owns_db:
+                await db.close()
     finally:
         await inspector.close()
 
@@ -312,24 +447,34 @@ async def main() -> None:
     
     args = parser.parse_args()
     
-    if args.command == "insert":
-        try:
-            data = json.loads(args.data)
-            result = await validate_and_insert(args.model, data, args.schema)
-            print(json.dumps(result, indent=2))
-        except json.JSONDecodeError:
-            print({"success": False, "message": "Invalid JSON data"})
-    
-    elif args.command == "fetch":
-        result = await fetch_and_validate(args.model, args.id, args.schema)
-        print(json.dumps(result, indent=2))
-    
-    elif args.command == "verify":
-        result = await verify_and_repair_schema(args.model, args.schema, args.repair)
-        print(json.dumps(result, indent=2))
-    
-    else:
+    if args.command not in ("insert", "fetch", "verify"):
         parser.print_help()
+        return
+    
+    # Share one database connection across the command
+    async with db_session() as db:
+        if args.command == "insert":
+            # Only the decode is guarded, so errors from the insert itself are not misreported
+            try:
+                data = _loads(args.data)
+            except json.JSONDecodeError:
+                print(_dumps({"success": False, "message": "Invalid JSON data"}))
+                return
+            
+            if not isinstance(data, dict):
+                print(_dumps({"success": False, "message": "Invalid JSON data: expected an object"}))
+                return
+            
+            result = await validate_and_insert(args.model, data, args.schema, db=db)
+            print(_dumps(result))
+        
+        elif args.command == "fetch":
+            result = await fetch_and_validate(args.model, args.id, args.schema, db=db)
+            print(_dumps(result))
+        
+        elif args.command == "verify":
+            result = await verify_and_repair_schema(args.model, args.schema, args.repair, db=db)
+            print(_dumps(result))
 
 
 if __name__ == "__main__":
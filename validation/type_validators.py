@@ -9,8 +9,168 @@ including basic types, collections, and custom types.
 """
 
 import re
-from typing import Any, Dict, List, Tuple, Optional, Union
+from typing import Any, Callable, Dict, List, Tuple, Optional, Union
 from datetime import datetime
+from functools import lru_cache
+
+# Every string datetime.fromisoformat accepts starts with a four-digit year;
+# checking that first avoids raising ValueError for obviously invalid input
+_ISO_YEAR_PREFIX_RE = re.compile(r"\d{4}")
+
+@lru_cache(maxsize=1024)
+def _is_iso_datetime(value: str) -> bool:
+    """Check whether datetime.fromisoformat accepts a string, caching repeated strings."""
+    try:
+        datetime.fromisoformat(value)
+        return True
+    except ValueError:
+        return False
+
+
+# A validation failure: either a message, or a (segment, key, inner failure)
+# link recording where inside a container the inner failure happened. Container
+# validators return links so nested failures are only formatted once, at the top.
+Failure = Union[str, Tuple[str, Any, Any]]
+
+# Message prefix for each failure path segment
+_FAILURE_PREFIXES: Dict[str, str] = {
+    "index": "invalid item at index {}: ",
+    "key": "invalid key: ",
+    "value": "invalid value for key '{}': ",
+}
+
+
+def _format_failure(failure: Failure) -> str:
+    """
+    Turn a failure into its error message, walking the path links once.
+    
+    Args:
+        failure: Message or (segment, key, inner failure) link
+        
+    Returns:
+        Error message, e.g. "invalid item at index 1: expected integer, got str"
+    """
+    if type(failure) is str:
+        return failure
+    parts = []
+    while type(failure) is not str:
+        segment, key, failure = failure
+        parts.append(_FAILURE_PREFIXES[segment].format(key))
+    parts.append(failure)
+    return "".join(parts)
+
+
+# Type strings validated directly by TypeValidator._basic_dispatch
+_BASIC_TYPE_NAMES = frozenset({"str", "int", "float", "bool", "Any", "any", "None", "none", "datetime"})
+
+# Parsed type: a tag ("basic", "list", "dict", "union", "optional" or
+# "unsupported") followed by its arguments, which are themselves parsed types
+# for containers, e.g. ("list", ("basic", "str"))
+ParsedSpec = Tuple[Any, ...]
+
+
+# Python types whose values a parsed basic type or container tag accepts directly
+_SPEC_PYTHON_TYPES: Dict[Any, Tuple[type, ...]] = {
+    "str": (str,),
+    "int": (int,),
+    "float": (float, int),
+    "bool": (bool,),
+    "None": (type(None),),
+    "none": (type(None),),
+    "datetime": (datetime, str),
+    "list": (list,),
+    "dict": (dict,),
+}
+
+
+@lru_cache(maxsize=256)
+def _union_first_choices(types: Tuple[ParsedSpec, ...]) -> Dict[type, ParsedSpec]:
+    """
+    Map Python types to the first union member that is likely to accept them.
+    
+    Args:
+        types: Parsed union member types, in declaration order
+        
+    Returns:
+        Dict from a value's type to the parsed member to try first
+    """
+    choices: Dict[type, ParsedSpec] = {}
+    for member_type in types:
+        key = member_type[1] if member_type[0] == "basic" else member_type[0]
+        for python_type in _SPEC_PYTHON_TYPES.get(key, ()):
+            choices.setdefault(python_type, member_type)
+    return choices
+
+
+def _split_type_args(args: str) -> List[str]:
+    """
+    Split type arguments on the commas that are not nested inside brackets.
+    
+    Args:
+        args: Text between a container's brackets (e.g., "str, List[int]")
+        
+    Returns:
+        List of the individual type argument strings
+    """
+    # Without nested brackets every comma separates arguments; str.split runs in C
+    if "[" not in args:
+        return args.split(",")
+    
+    parts = []
+    depth = 0
+    start = 0
+    for index, char in enumerate(args):
+        if char == "[":
+            depth += 1
+        elif char == "]":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(args[start:index])
+            start = index + 1
+    parts.append(args[start:])
+    return parts
+
+
+@lru_cache(maxsize=512)
+def _parse_type_spec(type_str: str) -> ParsedSpec:
+    """
+    Parse a type string into a tagged tuple tree.
+    
+    Type strings come from a small fixed set of model definitions, so the
+    parse is cached; container arguments are parsed recursively once, so
+    validating N items never re-parses the item type.
+    
+    Args:
+        type_str: Type string (e.g., "str", "List[str]", "Dict[str, int]")
+        
+    Returns:
+        Tuple of the type tag followed by its parsed type arguments
+    """
+    type_str = type_str.strip()
+    if type_str in _BASIC_TYPE_NAMES:
+        return ("basic", type_str)
+    
+    # Container types are Name[args]; plain string slicing avoids the regex engine
+    open_index = type_str.find("[")
+    if open_index > 0 and type_str.endswith("]"):
+        name = type_str[:open_index]
+        inner = type_str[open_index + 1:-1]
+        
+        if name == "List":
+            return ("list", _parse_type_spec(inner))
+        
+        if name == "Dict":
+            args = _split_type_args(inner)
+            if len(args) == 2:
+                return ("dict", _parse_type_spec(args[0]), _parse_type_spec(args[1]))
+        
+        elif name == "Union":
+            return ("union", tuple(_parse_type_spec(t) for t in _split_type_args(inner)))
+        
+        elif name == "Optional":
+            return ("optional", _parse_type_spec(inner))
+    
+    return ("unsupported", type_str)
 
 
 class TypeValidator:
@@ -21,6 +181,26 @@ class TypeValidator:
     data types, with support for complex type expressions.
     """
     
+    def __init__(self, strict_types: bool = False):
+        """
+        Initialize the validator, binding the basic type validators once for dispatch.
+        
+        Args:
+            strict_types: Accept only exact int/float values, rejecting subclasses such as IntEnum
+        """
+        self._strict_types = strict_types
+        self._basic_dispatch: Dict[str, Callable[[Any], Tuple[bool, str]]] = {
+            "str": self._validate_string,
+            "int": self._validate_integer,
+            "float": self._validate_float,
+            "bool": self._validate_boolean,
+            "Any": self._validate_any,
+            "any": self._validate_any,
+            "None": self._validate_none,
+            "none": self._validate_none,
+            "datetime": self._validate_datetime,
+        }
+    
     def validate_type(self, value: Any, expected_type: str) -> Tuple[bool, str]:
         """
         Validate a value against an expected type.
@@ -32,46 +212,40 @@ class TypeValidator:
         Returns:
             Tuple of (is_valid, error_message)
         """
-        expected_type = expected_type.strip()
-        
-        # Handle basic types
-        if expected_type == "str":
-            return self._validate_string(value)
-        elif expected_type == "int":
-            return self._validate_integer(value)
-        elif expected_type == "float":
-            return self._validate_float(value)
-        elif expected_type == "bool":
-            return self._validate_boolean(value)
-        elif expected_type == "Any" or expected_type == "any":
-            return True, ""
-        elif expected_type == "None" or expected_type == "none":
-            return self._validate_none(value)
-        elif expected_type == "datetime":
-            return self._validate_datetime(value)
-        
-        # Handle List types
-        list_match = re.match(r"List\[(.*)\]", expected_type)
-        if list_match:
-            return self._validate_list(value, list_match.group(1))
-        
-        # Handle Dict types
-        dict_match = re.match(r"Dict\[(.*),(.*)\]", expected_type)
-        if dict_match:
-            return self._validate_dict(value, dict_match.group(1), dict_match.group(2))
-        
-        # Handle Union types
-        union_match = re.match(r"Union\[(.*)\]", expected_type)
-        if union_match:
-            return self._validate_union(value, union_match.group(1))
-        
-        # Handle Optional types
-        optional_match = re.match(r"Optional\[(.*)\]", expected_type)
-        if optional_match:
-            return self._validate_optional(value, optional_match.group(1))
+        # Handle basic types with a single lookup
+        handler = self._basic_dispatch.get(expected_type)
+        if handler is not None:
+            return handler(value)
+        
+        is_valid, failure = self._validate_parsed(value, _parse_type_spec(expected_type))
+        return is_valid, _format_failure(failure)
+    
+    def _validate_parsed(self, value: Any, spec: ParsedSpec) -> Tuple[bool, Failure]:
+        """
+        Validate a value against a type already parsed by _parse_type_spec.
+        
+        Args:
+            value: Value to validate
+            spec: Parsed type
+            
+        Returns:
+            Tuple of (is_valid, failure), where failure is "" when valid
+        """
+        kind = spec[0]
+        if kind == "basic":
+            return self._basic_dispatch[spec[1]](value)
+        
+        # Handle container types, passing the parsed type arguments through
+        handler = _CONTAINER_HANDLERS.get(kind)
+        if handler is not None:
+            return handler(self, value, *spec[1:])
         
         # If we get here, the type is not supported
-        return False, f"unsupported type: {expected_type}"
+        return False, f"unsupported type: {spec[1]}"
+    
+    def _validate_any(self, value: Any) -> Tuple[bool, str]:
+        """Accept any value."""
+        return True, ""
     
     def _validate_string(self, value: Any) -> Tuple[bool, str]:
         """Validate a string value."""
@@ -81,19 +255,25 @@ class TypeValidator:
     
     def _validate_integer(self, value: Any) -> Tuple[bool, str]:
         """Validate an integer value."""
-        if isinstance(value, int) and not isinstance(value, bool):
+        # Exact type check first; isinstance only for int subclasses (bool excluded)
+        value_type = type(value)
+        if value_type is int or (not self._strict_types and value_type is not bool and isinstance(value, int)):
             return True, ""
-        return False, f"expected integer, got {type(value).__name__}"
+        return False, f"expected integer, got {value_type.__name__}"
     
     def _validate_float(self, value: Any) -> Tuple[bool, str]:
         """Validate a float value."""
-        if isinstance(value, (int, float)) and not isinstance(value, bool):
+        value_type = type(value)
+        if value_type is float or value_type is int or (
+            not self._strict_types and value_type is not bool and isinstance(value, (int, float))
+        ):
             return True, ""
-        return False, f"expected number, got {type(value).__name__}"
+        return False, f"expected number, got {value_type.__name__}"
     
     def _validate_boolean(self, value: Any) -> Tuple[bool, str]:
         """Validate a boolean value."""
-        if isinstance(value, bool):
+        # bool cannot be subclassed, so an identity check is exact
+        if type(value) is bool:
             return True, ""
         return False, f"expected boolean, got {type(value).__name__}"
     
@@ -108,65 +288,139 @@ class TypeValidator:
         if isinstance(value, datetime):
             return True, ""
         elif isinstance(value, str):
-            try:
-                datetime.fromisoformat(value)
+            if _ISO_YEAR_PREFIX_RE.match(value) and _is_iso_datetime(value):
                 return True, ""
-            except ValueError:
-                return False, "invalid datetime format"
+            return False, "invalid datetime format"
         return False, f"expected datetime or ISO format string, got {type(value).__name__}"
     
-    def _validate_list(self, value: Any, item_type: str) -> Tuple[bool, str]:
+    def _item_validator(self, item_type: ParsedSpec) -> Callable[[Any], Tuple[bool, Failure]]:
+        """Resolve the validator for a container's item type once, instead of per item."""
+        kind = item_type[0]
+        if kind == "basic":
+            return self._basic_dispatch[item_type[1]]
+        
+        # Bind the container handler and its parsed arguments so nested
+        # containers skip the _validate_parsed dispatch for every item
+        handler = _CONTAINER_HANDLERS.get(kind)
+        if handler is not None:
+            args = item_type[1:]
+            return lambda item: handler(self, item, *args)
+        return lambda item: self._validate_parsed(item, item_type)
+    
+    @staticmethod
+    def _exact_item_type(item_type: ParsedSpec) -> Optional[type]:
+        """Return the Python type that alone proves a value matches a basic type, if any."""
+        return _EXACT_ITEM_TYPES.get(item_type[1]) if item_type[0] == "basic" else None
+    
+    def _validate_list(self, value: Any, item_type: ParsedSpec) -> Tuple[bool, Failure]:
         """Validate a list value."""
         if not isinstance(value, list):
             return False, f"expected list, got {type(value).__name__}"
         
-        # Validate each item in the list
+        # List[Any] accepts any list without looking at the items
+        if item_type in _ANY_SPECS:
+            return True, ""
+        
+        # Fast path: every item is exactly a basic type (all() runs in C)
+        exact_type = self._exact_item_type(item_type)
+        if exact_type is not None and all(type(item) is exact_type for item in value):
+            return True, ""
+        
+        # Validate each item in the list, stopping at the first invalid one
+        validate_item = self._item_validator(item_type)
         for index, item in enumerate(value):
-            is_valid, error = self.validate_type(item, item_type)
+            is_valid, error = validate_item(item)
             if not is_valid:
-                return False, f"invalid item at index {index}: {error}"
+                return False, ("index", index, error)
         
         return True, ""
     
-    def _validate_dict(self, value: Any, key_type: str, value_type: str) -> Tuple[bool, str]:
+    def _validate_dict(self, value: Any, key_type: ParsedSpec, value_type: ParsedSpec) -> Tuple[bool, Failure]:
         """Validate a dictionary value."""
         if not isinstance(value, dict):
             return False, f"expected dictionary, got {type(value).__name__}"
         
-        # Validate each key-value pair
+        # Any keys or values need no checks (e.g. Dict[str, Any] only checks keys)
+        key_any = key_type in _ANY_SPECS
+        value_any = value_type in _ANY_SPECS
+        if key_any and value_any:
+            return True, ""
+        
+        # Fast path: every checked key and value is exactly a basic type
+        exact_key = self._exact_item_type(key_type)
+        exact_value = self._exact_item_type(value_type)
+        if (
+            (key_any or (exact_key is not None and all(type(k) is exact_key for k in value)))
+            and (value_any or (exact_value is not None and all(type(v) is exact_value for v in value.values())))
+        ):
+            return True, ""
+        
+        # Validate each key-value pair, stopping at the first invalid one
+        validate_key = None if key_any else self._item_validator(key_type)
+        validate_value = None if value_any else self._item_validator(value_type)
         for k, v in value.items():
             # Validate key
-            key_valid, key_error = self.validate_type(k, key_type)
-            if not key_valid:
-                return False, f"invalid key: {key_error}"
+            if validate_key is not None:
+                key_valid, key_error = validate_key(k)
+                if not key_valid:
+                    return False, ("key", k, key_error)
             
             # Validate value
-            value_valid, value_error = self.validate_type(v, value_type)
+            if validate_value is None:
+                continue
+            value_valid, value_error = validate_value(v)
             if not value_valid:
-                return False, f"invalid value for key '{k}': {value_error}"
+                return False, ("value", k, value_error)
         
         return True, ""
     
-    def _validate_union(self, value: Any, union_types: str) -> Tuple[bool, str]:
+    def _validate_union(self, value: Any, types: Tuple[ParsedSpec, ...]) -> Tuple[bool, str]:
         """Validate a value against a union of types."""
-        # Split the union types and normalize
-        types = [t.strip() for t in union_types.split(",")]
+        # Try the member matching the value's Python type first; it usually succeeds
+        first_choice = _union_first_choices(types).get(type(value))
+        if first_choice is not None:
+            first_valid, first_error = self._validate_parsed(value, first_choice)
+            if first_valid:
+                return True, ""
         
-        # Try each type
+        # Try each type, collecting errors in declaration order
         errors = []
-        for type_str in types:
-            is_valid, error = self.validate_type(value, type_str)
+        for member_type in types:
+            if member_type is first_choice:
+                errors.append(first_error)
+                continue
+            is_valid, error = self._validate_parsed(value, member_type)
             if is_valid:
                 return True, ""
             errors.append(error)
         
         # If we get here, none of the types matched
-        return False, f"value did not match any of the expected types: {', '.join(errors)}"
+        return False, f"value did not match any of the expected types: {', '.join(map(_format_failure, errors))}"
     
-    def _validate_optional(self, value: Any, inner_type: str) -> Tuple[bool, str]:
+    def _validate_optional(self, value: Any, inner_type: ParsedSpec) -> Tuple[bool, Failure]:
         """Validate an optional value."""
         if value is None:
             return True, ""
         
         # Validate the inner type
-        return self.validate_type(value, inner_type) 
\ No newline at end of file
+        return self._validate_parsed(value, inner_type)
+
+
+# Exact Python types that make a basic type string valid without further checks
+_EXACT_ITEM_TYPES: Dict[str, type] = {
+    "str": str,
+    "int": int,
+    "float": float,
+    "bool": bool,
+}
+
+# Parsed forms of Any, for which container items need no validation
+_ANY_SPECS = (("basic", "Any"), ("basic", "any"))
+
+# Validators for parsed container types, keyed by the _parse_type_spec tag
+_CONTAINER_HANDLERS: Dict[str, Callable[..., Tuple[bool, Failure]]] = {
+    "list": TypeValidator._validate_list,
+    "dict": TypeValidator._validate_dict,
+    "union": TypeValidator._validate_union,
+    "optional": TypeValidator._validate_optional,
+}
@@ -12,6 +12,12 @@ definitions and validation through Pydantic models when available.
 
 import re
 import logging
+import builtins
+import sys
+import weakref
+from dataclasses import dataclass
+from types import MappingProxyType
+from functools import lru_cache
 from typing import Dict, List, Any, Tuple, Optional, Type, Union
 from datetime import datetime
 
@@ -21,6 +27,71 @@ from services.models.validation.type_validators import TypeValidator
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=256)
+def _compile_validator(code: str, name: str) -> Any:
+    """
+    Compile custom validator source once; schemas repeat the same few validators.
+    
+    Args:
+        code: Python source of the validator
+        name: Validator name, used in the code object's filename for tracebacks
+        
+    Returns:
+        Compiled code object ready for exec
+    """
+    return compile(code, f"<validator:{name}>", "exec")
+
+
+# Shared read-only stand-in for a field definition without "args"
+_EMPTY_ARGS = MappingProxyType({})
+
+# Marks a field absent from the data being validated
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class _FieldLayout:
+    """
+    A schema's fields flattened into parallel tuples for the validation loop.
+    
+    Attributes:
+        names: Field names, in schema order
+        types: Type string of each field
+        required: Whether each field must be present (required and without a default)
+    """
+    __slots__ = ("names", "types", "required")
+    names: Tuple[str, ...]
+    types: Tuple[str, ...]
+    required: Tuple[bool, ...]
+    
+    @classmethod
+    def from_schema(cls, model_schema: Dict[str, Any]) -> "_FieldLayout":
+        """Flatten the "fields" of a model schema."""
+        fields = model_schema.get("fields", {})
+        field_defs = fields.values()
+        return cls(
+            # Interned so lookups with interned data keys match on identity
+            names=tuple(sys.intern(name) for name in fields),
+            types=tuple(field_def.get("type", "Any") for field_def in field_defs),
+            required=tuple(
+                bool(field_def.get("required", True))
+                and "default" not in (field_def.get("args") or _EMPTY_ARGS)
+                for field_def in field_defs
+            ),
+        )
+
+
+# TypeValidator holds no state, so validators share one instance by default
+_DEFAULT_TYPE_VALIDATOR = TypeValidator()
+
+
+def _error_tuple(error: Union[Dict[str, Any], Tuple[str, str, str]]) -> Tuple[str, str, str]:
+    """Normalize an error dictionary or tuple to a (path, message, code) tuple."""
+    if isinstance(error, tuple):
+        return error
+    return (error.get("path", ""), error.get("message", ""), error.get("code", "invalid"))
+
+
 class ValidationError(Exception):
     """Exception raised for validation errors."""
     
@@ -41,9 +112,14 @@ class ValidationResult:
     """
     Container for validation results.
     
+    Errors are stored as (path, message, code) tuples and only turned into
+    dictionaries when errors is read, so results that are just checked for
+    is_valid never build them. Once built, the errors list is the record of
+    errors, so appending to it directly is kept and affects is_valid.
+    
     Attributes:
-        is_valid: Whether the data is valid
-        errors: List of validation errors
+        is_valid: Whether the data is valid (False as soon as any error is recorded)
+        errors: List of validation errors, as path/message/code dictionaries
         warnings: List of validation warnings
         validated_data: The validated data after any coercion
     """
@@ -51,7 +127,7 @@ class ValidationResult:
     def __init__(
         self,
         is_valid: bool = True,
-        errors: List[Dict[str, Any]] = None,
+        errors: List[Union[Dict[str, Any], Tuple[str, str, str]]] = None,
         warnings: List[Dict[str, Any]] = None,
         validated_data: Optional[Dict[str, Any]] = None,
         original_data: Optional[Dict[str, Any]] = None
@@ -61,17 +137,58 @@ class ValidationResult:
         
         Args:
             is_valid: Whether the data is valid
-            errors: List of validation errors
+            errors: List of validation errors, as dictionaries or (path, message, code) tuples
             warnings: List of validation warnings
             validated_data: The validated data after coercion
             original_data: The original data before validation
         """
-        self.is_valid = is_valid
-        self.errors = errors or []
+        self._is_valid = is_valid
+        self._errors: List[Tuple[str, str, str]] = [_error_tuple(error) for error in errors] if errors else []
+        self._error_dicts: Optional[List[Dict[str, Any]]] = None
         self.warnings = warnings or []
         self.validated_data = validated_data
         self.original_data = original_data
     
+    @property
+    def is_valid(self) -> bool:
+        """Whether the data is valid: not marked invalid and no errors recorded."""
+        if self._error_dicts is not None:
+            return self._is_valid and not self._error_dicts
+        return self._is_valid and not self._errors
+    
+    @is_valid.setter
+    def is_valid(self, value: bool) -> None:
+        """Explicitly mark the result valid or invalid."""
+        self._is_valid = value
+    
+    @property
+    def errors(self) -> List[Dict[str, Any]]:
+        """Validation errors as dictionaries, built from the stored tuples on first access."""
+        if self._error_dicts is None:
+            self._error_dicts = self.as_dicts()
+            self._errors = []
+        return self._error_dicts
+    
+    @errors.setter
+    def errors(self, errors: List[Union[Dict[str, Any], Tuple[str, str, str]]]) -> None:
+        """Replace the recorded errors."""
+        self._errors = [_error_tuple(error) for error in errors]
+        self._error_dicts = None
+    
+    def as_dicts(self) -> List[Dict[str, Any]]:
+        """
+        Build a new list of the error dictionaries.
+        
+        Returns:
+            List of dictionaries with path, message and code keys
+        """
+        if self._error_dicts is not None:
+            return list(self._error_dicts)
+        return [
+            {"path": path, "message": message, "code": code}
+            for path, message, code in self._errors
+        ]
+    
     def add_error(self, path: str, message: str, code: str = "invalid") -> None:
         """
         Add an error to the validation result.
@@ -81,12 +198,10 @@ class ValidationResult:
             message: Error message
             code: Error code
         """
-        self.errors.append({
-            "path": path,
-            "message": message,
-            "code": code
-        })
-        self.is_valid = False
+        if self._error_dicts is not None:
+            self._error_dicts.append({"path": path, "message": message, "code": code})
+        else:
+            self._errors.append((path, message, code))
     
     def add_warning(self, path: str, message: str, code: str = "warning") -> None:
         """
@@ -112,46 +227,81 @@ class ModelValidator:
     with support for different validation strategies depending on the context.
     """
     
-    def __init__(self):
-        """Initialize the model validator."""
-        self.type_validator = TypeValidator()
+    # Schemas from model_class.to_schema() with their field layouts, shared by
+    # all validators; entries are dropped when their model class is garbage collected
+    _schema_cache: "weakref.WeakKeyDictionary[Type[BaseModel], Tuple[Dict[str, Any], _FieldLayout]]" = weakref.WeakKeyDictionary()
+    
+    def __init__(self, type_validator: Optional[TypeValidator] = None):
+        """
+        Initialize the model validator.
+        
+        Args:
+            type_validator: Optional TypeValidator to use instead of the shared default
+        """
+        self.type_validator = type_validator or _DEFAULT_TYPE_VALIDATOR
     
     def validate_against_model(
         self,
         data: Dict[str, Any],
         model_schema: Dict[str, Any],
-        partial: bool = False
+        partial: bool = False,
+        copy_on_success: bool = False
     ) -> ValidationResult:
         """
         Validate data against a model schema.
         
+        No coercion is performed, so on success validated_data is the input
+        dict itself unless copy_on_success is set.
+        
         Args:
             data: Data to validate
             model_schema: Model schema to validate against
             partial: Whether to allow partial validation (missing fields)
+            copy_on_success: Whether validated_data should be a shallow copy of data
             
         Returns:
             ValidationResult containing validation status and details
         """
-        result = ValidationResult(original_data=data)
+        return self._validate_with_layout(
+            data, model_schema, _FieldLayout.from_schema(model_schema), partial, copy_on_success
+        )
+    
+    def _validate_with_layout(
+        self,
+        data: Dict[str, Any],
+        model_schema: Dict[str, Any],
+        layout: _FieldLayout,
+        partial: bool,
+        copy_on_success: bool = False
+    ) -> ValidationResult:
+        """
+        Validate data against a model schema whose fields are already flattened.
         
-        # Validate required fields
-        for field_name, field_def in model_schema.get("fields", {}).items():
-            is_required = field_def.get("required", True)
+        Args:
+            data: Data to validate
+            model_schema: Model schema to validate against (used for its validators)
+            layout: Flattened fields of model_schema
+            partial: Whether to allow partial validation (missing fields)
+            copy_on_success: Whether validated_data should be a shallow copy of data
             
-            if field_name not in data:
-                # Check if field is required
-                if is_required and not partial and "default" not in field_def.get("args", {}):
-                    result.add_error(field_name, f"Missing required field: {field_name}")
+        Returns:
+            ValidationResult containing validation status and details
+        """
+        validate_type = self.type_validator.validate_type
+        errors = []
+        for field_name, field_type, is_required in zip(layout.names, layout.types, layout.required):
+            value = data.get(field_name, _MISSING)
+            if value is _MISSING:
+                # Absent fields are only an error when required and not defaulted
+                if is_required and not partial:
+                    errors.append((field_name, f"Missing required field: {field_name}", "invalid"))
                 continue
             
-            # Type validation
-            field_type = field_def.get("type", "Any")
-            field_value = data[field_name]
-            
-            type_valid, error_message = self.type_validator.validate_type(field_value, field_type)
+            type_valid, error_message = validate_type(value, field_type)
             if not type_valid:
-                result.add_error(field_name, f"Invalid type for {field_name}: {error_message}")
+                errors.append((field_name, f"Invalid type for {field_name}: {error_message}", "invalid"))
+        
+        result = ValidationResult(errors=errors, original_data=data)
         
         # Run custom validators if no errors so far
         if result.is_valid:
@@ -160,15 +310,17 @@ class ModelValidator:
                     # Execute validator code
                     validator_code = validator.get("code", "")
                     if validator_code:
+                        # Fresh globals per exec so a validator declaring a global
+                        # cannot leak state into other validators or validations
                         local_vars = {"data": data, "result": result}
-                        exec(validator_code, {}, local_vars)
+                        exec(_compile_validator(validator_code, validator.get("name", "unknown")), {"__builtins__": builtins}, local_vars)
                 except Exception as e:
                     validator_name = validator.get("name", "unknown")
                     result.add_error("", f"Validator {validator_name} failed: {str(e)}")
         
         # Set validated data if valid
         if result.is_valid:
-            result.validated_data = data.copy()
+            result.validated_data = data.copy() if copy_on_success else data
         
         return result
     
@@ -189,11 +341,16 @@ class ModelValidator:
         Returns:
             ValidationResult containing validation status and details
         """
-        # Convert model class to schema
-        model_schema = model_class.to_schema()
+        # Convert model class to schema and flatten its fields, once per class
+        cached = self._schema_cache.get(model_class)
+        if cached is None:
+            model_schema = model_class.to_schema()
+            cached = (model_schema, _FieldLayout.from_schema(model_schema))
+            self._schema_cache[model_class] = cached
         
         # Validate against schema
-        return self.validate_against_model(data, model_schema, partial)
+        model_schema, layout = cached
+        return self._validate_with_layout(data, model_schema, layout, partial)
     
     def validate_with_pydantic(
         self,
@@ -215,16 +372,16 @@ class ModelValidator:
         result = ValidationResult(original_data=data)
         
         try:
-            # Handle partial validation
-            if partial:
-                # Only validate fields that are present
-                partial_data = {k: v for k, v in data.items() if k in data}
-                model_instance = pydantic_model.parse_obj(partial_data)
+            # Pydantic v2 validates with model_validate; v1 only has parse_obj.
+            # Partial data is passed through as-is: the model decides which
+            # fields are optional.
+            model_validate = getattr(pydantic_model, "model_validate", None)
+            if model_validate is not None:
+                model_instance = model_validate(data)
+                result.validated_data = model_instance.model_dump()
             else:
                 model_instance = pydantic_model.parse_obj(data)
-            
-            # Successfully validated
-            result.validated_data = model_instance.dict()
+                result.validated_data = model_instance.dict()
             
         except Exception as e:
             result.is_valid = False